@@ -3,6 +3,7 @@
 Apply an arbitrary filter to each docstring
 '''
 
+import re
 import pdoc
 from io import StringIO
 from contextlib import redirect_stdout
@@ -37,6 +38,10 @@ substitutions = [
 	('CO2', 'CO<sub>2</sub>'),
 	]
 
+# apply all substitutions in a single pass, trying longer patterns first (e.g., `δ13C_VPDB` before `δ13C`):
+_subs = dict(substitutions)
+_subs_re = re.compile('|'.join(re.escape(x) for x in sorted(_subs, key = len, reverse = True)))
+
 def myfilter(docstr):
 	work = docstr.split('```')
 	for k in range(len(work)):
@@ -46,8 +51,7 @@ def myfilter(docstr):
 			work[k] = work[k].split('`')
 			for j in range(len(work[k])):
 				if not j%2:
-					for x,y in substitutions:
-						work[k][j] = work[k][j].replace(x,y)
+					work[k][j] = _subs_re.sub(lambda m: _subs[m.group(0)], work[k][j])
 			work[k] = '`'.join(work[k])
 	return ('```'.join(work))
 
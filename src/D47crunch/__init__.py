@@ -32,38 +32,19 @@ from statistics import stdev
 from scipy.stats import t as tstudent
 from scipy.stats import levene
 from scipy.interpolate import interp1d
+from scipy.linalg import solve_triangular
 from numpy import linalg
 from lmfit import Minimizer, Parameters, report_fit
-from matplotlib import pyplot as ppl
 from datetime import datetime as dt
-from functools import wraps
+from functools import wraps, lru_cache
 from colorsys import hls_to_rgb
-from matplotlib import rcParams
 
 typer.rich_utils.STYLE_HELPTEXT = ''
 
-rcParams['font.family'] = 'sans-serif'
-rcParams['font.sans-serif'] = 'Helvetica'
-rcParams['font.size'] = 10
-rcParams['mathtext.fontset'] = 'custom'
-rcParams['mathtext.rm'] = 'sans'
-rcParams['mathtext.bf'] = 'sans:bold'
-rcParams['mathtext.it'] = 'sans:italic'
-rcParams['mathtext.cal'] = 'sans:italic'
-rcParams['mathtext.default'] = 'rm'
-rcParams['xtick.major.size'] = 4
-rcParams['xtick.major.width'] = 1
-rcParams['ytick.major.size'] = 4
-rcParams['ytick.major.width'] = 1
-rcParams['axes.grid'] = False
-rcParams['axes.linewidth'] = 1
-rcParams['grid.linewidth'] = .75
-rcParams['grid.linestyle'] = '-'
-rcParams['grid.alpha'] = .15
-rcParams['savefig.dpi'] = 150
 
 Petersen_etal_CO2eqD47 = np.array([[-12, 1.147113572], [-11, 1.139961218], [-10, 1.132872856], [-9, 1.125847677], [-8, 1.118884889], [-7, 1.111983708], [-6, 1.105143366], [-5, 1.098363105], [-4, 1.091642182], [-3, 1.084979862], [-2, 1.078375423], [-1, 1.071828156], [0, 1.065337360], [1, 1.058902349], [2, 1.052522443], [3, 1.046196976], [4, 1.039925291], [5, 1.033706741], [6, 1.027540690], [7, 1.021426510], [8, 1.015363585], [9, 1.009351306], [10, 1.003389075], [11, 0.997476303], [12, 0.991612409], [13, 0.985796821], [14, 0.980028975], [15, 0.974308318], [16, 0.968634304], [17, 0.963006392], [18, 0.957424055], [19, 0.951886769], [20, 0.946394020], [21, 0.940945302], [22, 0.935540114], [23, 0.930177964], [24, 0.924858369], [25, 0.919580851], [26, 0.914344938], [27, 0.909150167], [28, 0.903996080], [29, 0.898882228], [30, 0.893808167], [31, 0.888773459], [32, 0.883777672], [33, 0.878820382], [34, 0.873901170], [35, 0.869019623], [36, 0.864175334], [37, 0.859367901], [38, 0.854596929], [39, 0.849862028], [40, 0.845162813], [41, 0.840498905], [42, 0.835869931], [43, 0.831275522], [44, 0.826715314], [45, 0.822188950], [46, 0.817696075], [47, 0.813236341], [48, 0.808809404], [49, 0.804414926], [50, 0.800052572], [51, 0.795722012], [52, 0.791422922], [53, 0.787154979], [54, 0.782917869], [55, 0.778711277], [56, 0.774534898], [57, 0.770388426], [58, 0.766271562], [59, 0.762184010], [60, 0.758125479], [61, 0.754095680], [62, 0.750094329], [63, 0.746121147], [64, 0.742175856], [65, 0.738258184], [66, 0.734367860], [67, 0.730504620], [68, 0.726668201], [69, 0.722858343], [70, 0.719074792], [71, 0.715317295], [72, 0.711585602], [73, 0.707879469], [74, 0.704198652], [75, 0.700542912], [76, 0.696912012], [77, 0.693305719], [78, 0.689723802], [79, 0.686166034], [80, 0.682632189], [81, 0.679122047], [82, 0.675635387], [83, 0.672171994], [84, 0.668731654], [85, 0.665314156], [86, 0.661919291], [87, 0.658546854], [88, 0.655196641], [89, 0.651868451], [90, 0.648562087], [91, 0.645277352], [92, 0.642014054], [93, 0.638771999], [94, 0.635551001], [95, 0.632350872], [96, 0.629171428], [97, 0.626012487], [98, 0.622873870], [99, 0.619755397], [100, 0.616656895], [102, 0.610519107], [104, 0.604459143], [106, 0.598475670], [108, 0.592567388], [110, 0.586733026], [112, 0.580971342], [114, 0.575281125], [116, 0.569661187], [118, 0.564110371], [120, 0.558627545], [122, 0.553211600], [124, 0.547861454], [126, 0.542576048], [128, 0.537354347], [130, 0.532195337], [132, 0.527098028], [134, 0.522061450], [136, 0.517084654], [138, 0.512166711], [140, 0.507306712], [142, 0.502503768], [144, 0.497757006], [146, 0.493065573], [148, 0.488428634], [150, 0.483845370], [152, 0.479314980], [154, 0.474836677], [156, 0.470409692], [158, 0.466033271], [160, 0.461706674], [162, 0.457429176], [164, 0.453200067], [166, 0.449018650], [168, 0.444884242], [170, 0.440796174], [172, 0.436753787], [174, 0.432756438], [176, 0.428803494], [178, 0.424894334], [180, 0.421028350], [182, 0.417204944], [184, 0.413423530], [186, 0.409683531], [188, 0.405984383], [190, 0.402325531], [192, 0.398706429], [194, 0.395126543], [196, 0.391585347], [198, 0.388082324], [200, 0.384616967], [202, 0.381188778], [204, 0.377797268], [206, 0.374441954], [208, 0.371122364], [210, 0.367838033], [212, 0.364588505], [214, 0.361373329], [216, 0.358192065], [218, 0.355044277], [220, 0.351929540], [222, 0.348847432], [224, 0.345797540], [226, 0.342779460], [228, 0.339792789], [230, 0.336837136], [232, 0.333912113], [234, 0.331017339], [236, 0.328152439], [238, 0.325317046], [240, 0.322510795], [242, 0.319733329], [244, 0.316984297], [246, 0.314263352], [248, 0.311570153], [250, 0.308904364], [252, 0.306265654], [254, 0.303653699], [256, 0.301068176], [258, 0.298508771], [260, 0.295975171], [262, 0.293467070], [264, 0.290984167], [266, 0.288526163], [268, 0.286092765], [270, 0.283683684], [272, 0.281298636], [274, 0.278937339], [276, 0.276599517], [278, 0.274284898], [280, 0.271993211], [282, 0.269724193], [284, 0.267477582], [286, 0.265253121], [288, 0.263050554], [290, 0.260869633], [292, 0.258710110], [294, 0.256571741], [296, 0.254454286], [298, 0.252357508], [300, 0.250281174], [302, 0.248225053], [304, 0.246188917], [306, 0.244172542], [308, 0.242175707], [310, 0.240198194], [312, 0.238239786], [314, 0.236300272], [316, 0.234379441], [318, 0.232477087], [320, 0.230593005], [322, 0.228726993], [324, 0.226878853], [326, 0.225048388], [328, 0.223235405], [330, 0.221439711], [332, 0.219661118], [334, 0.217899439], [336, 0.216154491], [338, 0.214426091], [340, 0.212714060], [342, 0.211018220], [344, 0.209338398], [346, 0.207674420], [348, 0.206026115], [350, 0.204393315], [355, 0.200378063], [360, 0.196456139], [365, 0.192625077], [370, 0.188882487], [375, 0.185226048], [380, 0.181653511], [385, 0.178162694], [390, 0.174751478], [395, 0.171417807], [400, 0.168159686], [405, 0.164975177], [410, 0.161862398], [415, 0.158819521], [420, 0.155844772], [425, 0.152936426], [430, 0.150092806], [435, 0.147312286], [440, 0.144593281], [445, 0.141934254], [450, 0.139333710], [455, 0.136790195], [460, 0.134302294], [465, 0.131868634], [470, 0.129487876], [475, 0.127158722], [480, 0.124879906], [485, 0.122650197], [490, 0.120468398], [495, 0.118333345], [500, 0.116243903], [505, 0.114198970], [510, 0.112197471], [515, 0.110238362], [520, 0.108320625], [525, 0.106443271], [530, 0.104605335], [535, 0.102805877], [540, 0.101043985], [545, 0.099318768], [550, 0.097629359], [555, 0.095974915], [560, 0.094354612], [565, 0.092767650], [570, 0.091213248], [575, 0.089690648], [580, 0.088199108], [585, 0.086737906], [590, 0.085306341], [595, 0.083903726], [600, 0.082529395], [605, 0.081182697], [610, 0.079862998], [615, 0.078569680], [620, 0.077302141], [625, 0.076059794], [630, 0.074842066], [635, 0.073648400], [640, 0.072478251], [645, 0.071331090], [650, 0.070206399], [655, 0.069103674], [660, 0.068022424], [665, 0.066962168], [670, 0.065922439], [675, 0.064902780], [680, 0.063902748], [685, 0.062921909], [690, 0.061959837], [695, 0.061016122], [700, 0.060090360], [705, 0.059182157], [710, 0.058291131], [715, 0.057416907], [720, 0.056559120], [725, 0.055717414], [730, 0.054891440], [735, 0.054080860], [740, 0.053285343], [745, 0.052504565], [750, 0.051738210], [755, 0.050985971], [760, 0.050247546], [765, 0.049522643], [770, 0.048810974], [775, 0.048112260], [780, 0.047426227], [785, 0.046752609], [790, 0.046091145], [795, 0.045441581], [800, 0.044803668], [805, 0.044177164], [810, 0.043561831], [815, 0.042957438], [820, 0.042363759], [825, 0.041780573], [830, 0.041207664], [835, 0.040644822], [840, 0.040091839], [845, 0.039548516], [850, 0.039014654], [855, 0.038490063], [860, 0.037974554], [865, 0.037467944], [870, 0.036970054], [875, 0.036480707], [880, 0.035999734], [885, 0.035526965], [890, 0.035062238], [895, 0.034605393], [900, 0.034156272], [905, 0.033714724], [910, 0.033280598], [915, 0.032853749], [920, 0.032434032], [925, 0.032021309], [930, 0.031615443], [935, 0.031216300], [940, 0.030823749], [945, 0.030437663], [950, 0.030057915], [955, 0.029684385], [960, 0.029316951], [965, 0.028955498], [970, 0.028599910], [975, 0.028250075], [980, 0.027905884], [985, 0.027567229], [990, 0.027234006], [995, 0.026906112], [1000, 0.026583445], [1005, 0.026265908], [1010, 0.025953405], [1015, 0.025645841], [1020, 0.025343124], [1025, 0.025045163], [1030, 0.024751871], [1035, 0.024463160], [1040, 0.024178947], [1045, 0.023899147], [1050, 0.023623680], [1055, 0.023352467], [1060, 0.023085429], [1065, 0.022822491], [1070, 0.022563577], [1075, 0.022308615], [1080, 0.022057533], [1085, 0.021810260], [1090, 0.021566729], [1095, 0.021326872], [1100, 0.021090622]])
 _fCO2eqD47_Petersen = interp1d(Petersen_etal_CO2eqD47[:,0], Petersen_etal_CO2eqD47[:,1])
+@lru_cache(maxsize = None)
 def fCO2eqD47_Petersen(T):
 	'''
 	CO2 equilibrium Δ47 value as a function of T (in degrees C)
@@ -75,6 +56,7 @@ def fCO2eqD47_Petersen(T):
 
 Wang_etal_CO2eqD47 = np.array([[-83., 1.8954], [-73., 1.7530], [-63., 1.6261], [-53., 1.5126], [-43., 1.4104], [-33., 1.3182], [-23., 1.2345], [-13., 1.1584], [-3., 1.0888], [7., 1.0251], [17., 0.9665], [27., 0.9125], [37., 0.8626], [47., 0.8164], [57., 0.7734], [67., 0.7334], [87., 0.6612], [97., 0.6286], [107., 0.5980], [117., 0.5693], [127., 0.5423], [137., 0.5169], [147., 0.4930], [157., 0.4704], [167., 0.4491], [177., 0.4289], [187., 0.4098], [197., 0.3918], [207., 0.3747], [217., 0.3585], [227., 0.3431], [237., 0.3285], [247., 0.3147], [257., 0.3015], [267., 0.2890], [277., 0.2771], [287., 0.2657], [297., 0.2550], [307., 0.2447], [317., 0.2349], [327., 0.2256], [337., 0.2167], [347., 0.2083], [357., 0.2002], [367., 0.1925], [377., 0.1851], [387., 0.1781], [397., 0.1714], [407., 0.1650], [417., 0.1589], [427., 0.1530], [437., 0.1474], [447., 0.1421], [457., 0.1370], [467., 0.1321], [477., 0.1274], [487., 0.1229], [497., 0.1186], [507., 0.1145], [517., 0.1105], [527., 0.1068], [537., 0.1031], [547., 0.0997], [557., 0.0963], [567., 0.0931], [577., 0.0901], [587., 0.0871], [597., 0.0843], [607., 0.0816], [617., 0.0790], [627., 0.0765], [637., 0.0741], [647., 0.0718], [657., 0.0695], [667., 0.0674], [677., 0.0654], [687., 0.0634], [697., 0.0615], [707., 0.0597], [717., 0.0579], [727., 0.0562], [737., 0.0546], [747., 0.0530], [757., 0.0515], [767., 0.0500], [777., 0.0486], [787., 0.0472], [797., 0.0459], [807., 0.0447], [817., 0.0435], [827., 0.0423], [837., 0.0411], [847., 0.0400], [857., 0.0390], [867., 0.0380], [877., 0.0370], [887., 0.0360], [897., 0.0351], [907., 0.0342], [917., 0.0333], [927., 0.0325], [937., 0.0317], [947., 0.0309], [957., 0.0302], [967., 0.0294], [977., 0.0287], [987., 0.0281], [997., 0.0274], [1007., 0.0268], [1017., 0.0261], [1027., 0.0255], [1037., 0.0249], [1047., 0.0244], [1057., 0.0238], [1067., 0.0233], [1077., 0.0228], [1087., 0.0223], [1097., 0.0218]])
 _fCO2eqD47_Wang = interp1d(Wang_etal_CO2eqD47[:,0] - 0.15, Wang_etal_CO2eqD47[:,1])
+@lru_cache(maxsize = None)
 def fCO2eqD47_Wang(T):
 	'''
 	CO2 equilibrium Δ47 value as a function of `T` (in degrees C)
@@ -98,9 +80,10 @@ def correlated_sum(X, C, w = None):
 	Return the sum (and its SE) of the elements of `X`, with optional weights equal
 	to the elements of `w`, accounting for covariances between the elements of `X`.
 	'''
-	if w is None:
-		w = [1 for x in X]
-	return np.dot(w,X), (np.dot(w,np.dot(C,w)))**.5
+	X = np.asarray(X, dtype = float)
+	C = np.asarray(C, dtype = float)
+	w = np.ones(X.size) if w is None else np.asarray(w, dtype = float)
+	return float(w @ X), float((w @ (C @ w))**.5)
 
 
 def make_csv(x, hsep = ',', vsep = '\n'):
@@ -126,14 +109,17 @@ def make_csv(x, hsep = ',', vsep = '\n'):
 	d,e,f
 	```
 	'''
-	return vsep.join([hsep.join(l) for l in x])
+	return vsep.join(map(hsep.join, x))
 
 
+_pf_table = str.maketrans('-. ', '___')
+
+@lru_cache(maxsize = None)
 def pf(txt):
 	'''
 	Modify string `txt` to follow `lmfit.Parameter()` naming rules.
 	'''
-	return txt.replace('-','_').replace('.','_').replace(' ','_')
+	return txt.translate(_pf_table)
 
 
 def smart_type(x):
@@ -212,19 +198,21 @@ def pretty_table(x, header = 1, hsep = '  ', vsep = None, align = '<'):
 	if vsep is None:
 		vsep = D47crunch_defaults.PRETTY_TABLE_VSEP
 	
-	txt = []
-	widths = [np.max([len(e) for e in c]) for c in zip(*x)]
+	widths = [max(map(len, c)) for c in zip(*x)]
 
 	if len(widths) > len(align):
 		align += '>' * (len(widths)-len(align))
-	sepline = hsep.join([vsep*w for w in widths])
-	txt += [sepline]
-	for k,l in enumerate(x):
+	sepline = hsep.join(vsep*w for w in widths)
+	# a single format string for all rows, e.g. '{:<2}  {:>6}  {:>3}':
+	rowfmt = hsep.join(f'{{:{a}{w}}}' for w, a in zip(widths, align))
+	rows = (rowfmt.format(*l[:len(widths)]) for l in x)
+	txt = [sepline]
+	for k,l in enumerate(rows):
 		if k and k == header:
-			txt += [sepline]
-		txt += [hsep.join([f'{e:{a}{w}}' for e, w, a in zip(l, widths, align)])]
-	txt += [sepline]
-	txt += ['']
+			txt.append(sepline)
+		txt.append(l)
+	txt.append(sepline)
+	txt.append('')
 	return '\n'.join(txt)
 
 
@@ -243,7 +231,7 @@ def transpose_table(x):
 	print(transpose_table(x)) # yields: [[1, 3], [2, 4]]
 	```
 	'''
-	return [[e for e in c] for c in zip(*x)]
+	return [list(c) for c in zip(*x)]
 
 
 def w_avg(X, sX) :
@@ -268,13 +256,11 @@ def w_avg(X, sX) :
 	print(w_avg(*zip(*foo))) # yields: (1.3333333333333333, 0.3333333333333333)
 	```
 	'''
-	X = [ x for x in X ]
-	sX = [ sx for sx in sX ]
-	W = [ sx**-2 for sx in sX ]
-	W = [ w/sum(W) for w in W ]
-	Xavg = sum([ w*x for w,x in zip(W,X) ])
-	sXavg = sum([ w**2*sx**2 for w,sx in zip(W,sX) ])**.5
-	return Xavg, sXavg
+	X = np.asarray(X, dtype = float)
+	sX = np.asarray(sX, dtype = float)
+	W = sX**-2
+	W /= W.sum()
+	return float(W @ X), float(((W * sX)**2).sum()**.5)
 
 
 def read_csv(filename, sep = ''):
@@ -552,9 +538,11 @@ def virtual_data(
 				if var in s},
 			}
 
+		# error-free analysis, identical for all replicates of this sample:
+		r0 = simulate_single_analysis(**kw)
 		sN = s['N']
 		while sN:
-			out.append(simulate_single_analysis(**kw))
+			out.append(dict(r0))
 			out[-1]['d45'] += errors45[k]
 			out[-1]['d46'] += errors46[k]
 			out[-1]['d47'] += (errors45[k] + errors46[k] + errors47[k]) * a47
@@ -761,13 +749,11 @@ def table_of_analyses(
 			out48 = data48.table_of_analyses(save_to_file = False, print_out = False, output = 'raw')
 			
 			if [l[1] for l in out47[1:]] == [l[1] for l in out48[1:]]: # if sessions are identical
-				out = transpose_table(transpose_table(out47) + transpose_table(out48)[-1:])
+				out = [l47 + l48[-1:] for l47, l48 in zip(out47, out48)]
 			else:
 				out47[0][1] = 'Session_47'
 				out48[0][1] = 'Session_48'
-				out47 = transpose_table(out47)
-				out48 = transpose_table(out48)
-				out = transpose_table(out47[:2] + out48[1:2] + out47[2:] + out48[-1:])
+				out = [l47[:2] + l48[1:2] + l47[2:] + l48[-1:] for l47, l48 in zip(out47, out48)]
 
 			if save_to_file:
 				if not os.path.exists(dir):
@@ -784,6 +770,55 @@ def table_of_analyses(
 				return pretty_table(out)
 
 
+@lru_cache(maxsize = None)
+def _t95(Nf):
+	'''
+	Student's t-factor for 95 % confidence limits with `Nf` degrees of freedom
+	'''
+	return float(tstudent.isf(0.05/2, Nf))
+
+
+def _group_min_max(values, groups, ngroups):
+	'''
+	Return the minimum and maximum of `values` within each group, where
+	`groups` holds the integer group index (`0 <= groups < ngroups`) of each value.
+	Empty groups have a minimum of `+inf` and a maximum of `-inf`.
+	'''
+	order = np.argsort(groups, kind = 'stable')
+	groups, values = groups[order], np.asarray(values, dtype = float)[order]
+	vmin, vmax = np.full(ngroups, np.inf), np.full(ngroups, -np.inf)
+	if len(values):
+		starts = np.flatnonzero(np.diff(groups, prepend = -1))
+		vmin[groups[starts]] = np.minimum.reduceat(values, starts)
+		vmax[groups[starts]] = np.maximum.reduceat(values, starts)
+	return vmin, vmax
+
+
+def _gaussian_kde(X, yi, exact_max = 10000):
+	'''
+	Evaluate the Gaussian kernel density estimate of `X` (with Scott's rule
+	bandwidth, as in `scipy.stats.gaussian_kde`) at points `yi`.
+
+	For more than `exact_max` values in `X`, the exact O(N·M) sum is replaced by
+	the FFT convolution of a fine histogram of `X` with the Gaussian kernel.
+	'''
+	from scipy.stats import gaussian_kde
+	kde = gaussian_kde(X)
+	if len(X) <= exact_max:
+		return kde.evaluate(yi)
+
+	from scipy.signal import fftconvolve
+	bw = kde.covariance[0,0]**.5
+	lo, hi = np.min(yi) - 5*bw, np.max(yi) + 5*bw
+	bins = int(min(2**16, np.ceil(8 * (hi - lo) / bw)))
+	h, edges = np.histogram(X, bins = bins, range = (lo, hi))
+	dx = edges[1] - edges[0]
+	u = np.arange(-np.ceil(5*bw/dx), np.ceil(5*bw/dx) + 1) * dx
+	kernel = np.exp(-u**2 / 2 / bw**2) / (2 * np.pi)**.5 / bw
+	density = fftconvolve(h, kernel, mode = 'same') / len(X)
+	return np.interp(yi, (edges[:-1] + edges[1:])/2, density)
+
+
 def _fullcovar(minresult, epsilon = 0.01, named = False):
 	'''
 	Construct full covariance matrix in the case of constrained parameters
@@ -829,6 +864,82 @@ def _fullcovar(minresult, epsilon = 0.01, named = False):
 	return _names, _covar, _se, _correl
 
 
+_ppl = None
+
+def _pyplot():
+	'''
+	Import `matplotlib.pyplot` on first use and apply the D47crunch plotting defaults
+	'''
+	global _ppl
+	if _ppl is None:
+		from matplotlib import pyplot, rcParams
+		rcParams['font.family'] = 'sans-serif'
+		rcParams['font.sans-serif'] = 'Helvetica'
+		rcParams['font.size'] = 10
+		rcParams['mathtext.fontset'] = 'custom'
+		rcParams['mathtext.rm'] = 'sans'
+		rcParams['mathtext.bf'] = 'sans:bold'
+		rcParams['mathtext.it'] = 'sans:italic'
+		rcParams['mathtext.cal'] = 'sans:italic'
+		rcParams['mathtext.default'] = 'rm'
+		rcParams['xtick.major.size'] = 4
+		rcParams['xtick.major.width'] = 1
+		rcParams['ytick.major.size'] = 4
+		rcParams['ytick.major.width'] = 1
+		rcParams['axes.grid'] = False
+		rcParams['axes.linewidth'] = 1
+		rcParams['grid.linewidth'] = .75
+		rcParams['grid.linestyle'] = '-'
+		rcParams['grid.alpha'] = .15
+		rcParams['savefig.dpi'] = 150
+		_ppl = pyplot
+	return _ppl
+
+
+def _parse_analyses(txt, sep = ''):
+	'''
+	Parse a csv string of raw analyses into a list of dictionaries
+	(used by `D4xdata.input()` and `_read_analyses()`)
+	'''
+	if sep == '':
+		sep = sorted(',;\t', key = lambda x: - txt.count(x))[0]
+	txt = [[x.strip() for x in l.split(sep)] for l in txt.splitlines() if l.strip()]
+	return [{k: v if k in ['UID', 'Session', 'Sample'] else smart_type(v) for k,v in zip(txt[0], l) if v != ''} for l in txt[1:]]
+
+
+@lru_cache(maxsize = 4)
+def _read_analyses(filename, mtime, size, sep = ''):
+	'''
+	Parse a csv file of raw analyses, caching the results for the last few files read
+	(used by `D4xdata.read()`). `mtime` and `size` are only used as cache keys, so that
+	modified files are parsed again. Callers must copy the returned records before
+	modifying them.
+	'''
+	with open(filename) as fid:
+		return tuple(_parse_analyses(fid.read(), sep))
+
+
+def _render_session(args):
+	'''
+	Render and save the plot for a single session, in a worker process
+	(used by `D4xdata.plot_sessions()`)
+	'''
+	ppl = _pyplot()
+	mass, Nominal_D4x, records, session, session_params, unknowns_D4x, xylimits, filename, savefig_kwargs = args
+
+	X = D4xdata(mass = mass)
+	X.Nominal_D4x = Nominal_D4x
+	X += records
+	X.refresh()
+	X.sessions[session].update(session_params)
+	for u in X.unknowns:
+		X.unknowns[u][f'D{mass}'] = unknowns_D4x[u]
+
+	sp = X.plot_single_session(session, xylimits = xylimits)
+	ppl.savefig(filename, **savefig_kwargs)
+	ppl.close(sp.fig)
+
+
 class D4xdata(list):
 	'''
 	Store and process data for a large set of Δ47 and/or Δ48
@@ -971,6 +1082,9 @@ class D4xdata(list):
 		list.__init__(self, l)
 		self.Nf = None
 		self.repeatability = {}
+		self._columns = None
+		self._var_index = None
+		self._constrained = None
 		self.refresh(session = session)
 
 
@@ -1016,9 +1130,9 @@ class D4xdata(list):
 		Log a message to `self.logfile`
 		'''
 		if self.logfile:
+			prefix = f'\n{dt.now().strftime("%Y-%m-%d %H:%M:%S")} {f"[{self.prefix}]":<16} '
 			with open(self.logfile, 'a') as fid:
-				for txt in txts:
-					fid.write(f'\n{dt.now().strftime("%Y-%m-%d %H:%M:%S")} {f"[{self.prefix}]":<16} {txt}')
+				fid.write(''.join([prefix + str(txt) for txt in txts]))
 
 
 	def refresh(self, session = 'mySession'):
@@ -1035,10 +1149,14 @@ class D4xdata(list):
 		Update `self.sessions` and set `scrambling_drift`, `slope_drift`, and `wg_drift`
 		to `False` for all sessions.
 		'''
-		self.sessions = {
-			s: {'data': [r for r in self if r['Session'] == s]}
-			for s in sorted({r['Session'] for r in self})
-			}
+		# group analyses by session in a single pass:
+		rows = {}
+		for r in self:
+			rows.setdefault(r['Session'], []).append(r)
+		self.sessions = {s: {'data': rows[s]} for s in sorted(rows)}
+		_session_codes = {s: k for k,s in enumerate(self.sessions)}
+		self._session_index = np.fromiter((_session_codes[r['Session']] for r in self), dtype = int, count = len(self))
+		self._session_mask = {s: self._session_index == k for s,k in _session_codes.items()}
 		for s in self.sessions:
 			self.sessions[s]['scrambling_drift'] = False
 			self.sessions[s]['slope_drift'] = False
@@ -1051,15 +1169,58 @@ class D4xdata(list):
 		'''
 		Define `self.samples`, `self.anchors`, and `self.unknowns`.
 		'''
-		self.samples = {
-			s: {'data': [r for r in self if r['Sample'] == s]}
-			for s in sorted({r['Sample'] for r in self})
-			}
+		# group analyses by sample in a single pass:
+		rows = {}
+		for r in self:
+			rows.setdefault(r['Sample'], []).append(r)
+		self.samples = {s: {'data': rows[s]} for s in sorted(rows)}
 		self.anchors = {s: self.samples[s] for s in self.samples if s in self.Nominal_D4x}
 		self.unknowns = {s: self.samples[s] for s in self.samples if s not in self.Nominal_D4x}
+		_sample_codes = {s: k for k,s in enumerate(self.samples)}
+		self._sample_index = np.fromiter((_sample_codes[r['Sample']] for r in self), dtype = int, count = len(self))
+		self._anchor_mask = np.array([s in self.anchors for s in self.samples], dtype = bool)[self._sample_index]
+		self._rows_by_sample_session = {}
+		for k,r in enumerate(self):
+			self._rows_by_sample_session.setdefault((r['Sample'], r['Session']), []).append(k)
+		self._rows_by_sample_session = {k: np.array(v) for k,v in self._rows_by_sample_session.items()}
+		self._samples_by_session = {}
+		for sample, session in self._rows_by_sample_session:
+			self._samples_by_session.setdefault(session, set()).add(sample)
+
+
+	def _column(self, key, dtype = float):
+		'''
+		Return `[r[key] for r in self]` as a NumPy array, gathered in a single pass.
+
+		While `consolidate()` is running, analyses are not modified except through
+		`_set_column()`, so each column is only gathered once and then reused.
+		'''
+		if self._columns is None:
+			return np.fromiter((r[key] for r in self), dtype = dtype, count = len(self))
+		if key not in self._columns:
+			self._columns[key] = np.fromiter((r[key] for r in self), dtype = dtype, count = len(self))
+		return self._columns[key]
+
+
+	def _set_column(self, key, values):
+		'''
+		Assign `r[key] = v` for each analysis `r` and corresponding value `v` in `values`.
+		'''
+		for r, v in zip(self, values):
+			r[key] = v
+		if self._columns is not None:
+			self._columns[key] = values
+
+
+	def _rows(self, sample, sessions):
+		'''
+		Return the sorted indices of the analyses of `sample` within `sessions`.
+		'''
+		G = [self._rows_by_sample_session[(sample, session)] for session in sessions if (sample, session) in self._rows_by_sample_session]
+		return np.sort(np.concatenate(G)) if G else np.array([], dtype = int)
 
 
-	def read(self, filename, sep = '', session = ''):
+	def read(self, filename, sep = '', session = '', defer_refresh = False):
 		'''
 		Read file in csv format to load data into a `D47data` object.
 
@@ -1082,12 +1243,16 @@ class D4xdata(list):
 		+ `fileneme`: the path of the file to read
 		+ `sep`: csv separator delimiting the fields
 		+ `session`: set `Session` field to this string for all analyses
+		+ `defer_refresh`: if `True`, do not call `D4xdata.refresh()` after reading the data.
+		When reading several files in a row, this avoids refreshing the object after each file,
+		but `D4xdata.refresh()` must then be called after reading the last one.
 		'''
-		with open(filename) as fid:
-			self.input(fid.read(), sep = sep, session = session)
+		stat = os.stat(filename)
+		data = _read_analyses(os.path.abspath(filename), stat.st_mtime_ns, stat.st_size, sep)
+		self._add_analyses([dict(r) for r in data], session = session, defer_refresh = defer_refresh)
 
 
-	def input(self, txt, sep = '', session = ''):
+	def input(self, txt, sep = '', session = '', defer_refresh = False):
 		'''
 		Read `txt` string in csv format to load analysis data into a `D47data` object.
 
@@ -1111,18 +1276,23 @@ class D4xdata(list):
 		+ `sep`: csv separator delimiting the fields. By default, use `,`, `;`, or `\t`,
 		whichever appers most often in `txt`.
 		+ `session`: set `Session` field to this string for all analyses
+		+ `defer_refresh`: if `True`, do not call `D4xdata.refresh()` after reading the data
+		(see `D4xdata.read()`).
 		'''
-		if sep == '':
-			sep = sorted(',;\t', key = lambda x: - txt.count(x))[0]
-		txt = [[x.strip() for x in l.split(sep)] for l in txt.splitlines() if l.strip()]
-		data = [{k: v if k in ['UID', 'Session', 'Sample'] else smart_type(v) for k,v in zip(txt[0], l) if v != ''} for l in txt[1:]]
+		self._add_analyses(_parse_analyses(txt, sep), session = session, defer_refresh = defer_refresh)
 
+
+	def _add_analyses(self, data, session = '', defer_refresh = False):
+		'''
+		Append parsed analyses (used by `D4xdata.read()` and `D4xdata.input()`)
+		'''
 		if session != '':
 			for r in data:
 				r['Session'] = session
 
 		self += data
-		self.refresh()
+		if not defer_refresh:
+			self.refresh()
 
 
 	@make_verbal
@@ -1168,52 +1338,42 @@ class D4xdata(list):
 			R46_s = (C628_s + C637_s + C727_s) / C626_s
 			R45R46_standards[sample] = (R45_s, R46_s)
 		
+		# R45 and R46 of the standards, for each analysis (NaN for other samples):
+		R45_s, R46_s = np.array([R45R46_standards.get(sample, (np.nan, np.nan)) for sample in self.samples]).reshape((-1, 2)).T
+		R45_s, R46_s = R45_s[self._sample_index], R46_s[self._sample_index]
+		is_standard = ~np.isnan(R45_s)
+		d45 = self._column('d45')
+		d46 = self._column('d46')
+
+		R45_wg, R46_wg = [], []
 		for s in self.sessions:
-			db = [r for r in self.sessions[s]['data'] if r['Sample'] in samples]
-			assert db, f'No sample from {samples} found in session "{s}".'
-# 			dbsamples = sorted({r['Sample'] for r in db})
-
-			X = [r['d45'] for r in db]
-			Y = [R45R46_standards[r['Sample']][0] for r in db]
-			x1, x2 = np.min(X), np.max(X)
+			db = self._session_mask[s] & is_standard
+			assert db.any(), f'No sample from {samples} found in session "{s}".'
 
-			if x1 < x2:
-				wgcoord = x1/(x1-x2)
-			else:
-				wgcoord = 999
-
-			if wgcoord < -.5 or wgcoord > 1.5:
-				# unreasonable to extrapolate to d45 = 0
-				R45_wg = np.mean([y/(1+x/1000) for x,y in zip(X,Y)])
-			else :
-				# d45 = 0 is reasonably well bracketed
-				R45_wg = np.polyfit(X, Y, 1)[1]
+			for X, Y, R_wg in [(d45[db], R45_s[db], R45_wg), (d46[db], R46_s[db], R46_wg)]:
+				x1, x2 = np.min(X), np.max(X)
 
-			X = [r['d46'] for r in db]
-			Y = [R45R46_standards[r['Sample']][1] for r in db]
-			x1, x2 = np.min(X), np.max(X)
-
-			if x1 < x2:
-				wgcoord = x1/(x1-x2)
-			else:
-				wgcoord = 999
+				if x1 < x2:
+					wgcoord = x1/(x1-x2)
+				else:
+					wgcoord = 999
 
-			if wgcoord < -.5 or wgcoord > 1.5:
-				# unreasonable to extrapolate to d46 = 0
-				R46_wg = np.mean([y/(1+x/1000) for x,y in zip(X,Y)])
-			else :
-				# d46 = 0 is reasonably well bracketed
-				R46_wg = np.polyfit(X, Y, 1)[1]
+				if wgcoord < -.5 or wgcoord > 1.5:
+					# unreasonable to extrapolate to d45 = 0 or d46 = 0
+					R_wg.append(np.mean(Y/(1+X/1000)))
+				else :
+					# d45 = 0 or d46 = 0 is reasonably well bracketed
+					R_wg.append(np.polyfit(X, Y, 1)[1])
 
-			d13Cwg_VPDB, d18Owg_VSMOW = self.compute_bulk_delta(R45_wg, R46_wg)
+		d13Cwg_VPDB, d18Owg_VSMOW = self.compute_bulk_delta(np.array(R45_wg), np.array(R46_wg))
 
-			self.msg(f'Session {s} WG:   δ13C_VPDB = {d13Cwg_VPDB:.3f}   δ18O_VSMOW = {d18Owg_VSMOW:.3f}')
+		for k,s in enumerate(self.sessions):
+			self.msg(f'Session {s} WG:   δ13C_VPDB = {d13Cwg_VPDB[k]:.3f}   δ18O_VSMOW = {d18Owg_VSMOW[k]:.3f}')
+			self.sessions[s]['d13Cwg_VPDB'] = d13Cwg_VPDB[k]
+			self.sessions[s]['d18Owg_VSMOW'] = d18Owg_VSMOW[k]
 
-			self.sessions[s]['d13Cwg_VPDB'] = d13Cwg_VPDB
-			self.sessions[s]['d18Owg_VSMOW'] = d18Owg_VSMOW
-			for r in self.sessions[s]['data']:
-				r['d13Cwg_VPDB'] = d13Cwg_VPDB
-				r['d18Owg_VSMOW'] = d18Owg_VSMOW
+		self._set_column('d13Cwg_VPDB', d13Cwg_VPDB[self._session_index])
+		self._set_column('d18Owg_VSMOW', d18Owg_VSMOW[self._session_index])
 
 
 	def compute_bulk_delta(self, R45, R46, D17O = 0):
@@ -1224,6 +1384,9 @@ class D4xdata(list):
 		assuming that δ18O_VSMOW is not too big (0 ± 50 ‰) and
 		solving the corresponding second-order Taylor polynomial.
 		(Appendix A of [Daëron et al., 2016](https://doi.org/10.1016/j.chemgeo.2016.08.014))
+
+		`R45`, `R46` and `D17O` may also be arrays (of broadcastable shapes),
+		in which case arrays of δ13C_VPDB and δ18O_VSMOW values are returned.
 		'''
 
 		K = np.exp(D17O / 1000) * self.R17_VSMOW * self.R18_VSMOW ** -self.LAMBDA_17
@@ -1237,7 +1400,7 @@ class D4xdata(list):
 		bb = 2 * A * self.LAMBDA_17 + B * self.LAMBDA_17 + C
 		cc = A + B + C + D
 
-		d18O_VSMOW = 1000 * (-bb + (bb ** 2 - 4 * aa * cc) ** .5) / (2 * aa)
+		d18O_VSMOW = 1000 * (-bb + np.sqrt(bb ** 2 - 4 * aa * cc)) / (2 * aa)
 
 		R18 = (1 + d18O_VSMOW / 1000) * self.R18_VSMOW
 		R17 = K * R18 ** self.LAMBDA_17
@@ -1252,9 +1415,48 @@ class D4xdata(list):
 	def crunch(self, verbose = ''):
 		'''
 		Compute bulk composition and raw clumped isotope anomalies for all analyses.
+
+		This applies the same algebra as `D4xdata.compute_bulk_and_clumping_deltas()`,
+		but to all analyses at once.
 		'''
-		for r in self:
-			self.compute_bulk_and_clumping_deltas(r)
+		# Compute working gas R13, R18, and isobar ratios
+		R13_wg = self.R13_VPDB * (1 + self._column('d13Cwg_VPDB') / 1000)
+		R18_wg = self.R18_VSMOW * (1 + self._column('d18Owg_VSMOW') / 1000)
+		R45_wg, R46_wg, R47_wg, R48_wg, R49_wg = self.compute_isobar_ratios(R13_wg, R18_wg)
+
+		# Compute analyte isobar ratios
+		R45 = (1 + self._column('d45') / 1000) * R45_wg
+		R46 = (1 + self._column('d46') / 1000) * R46_wg
+		R47 = (1 + self._column('d47') / 1000) * R47_wg
+		R48 = (1 + self._column('d48') / 1000) * R48_wg
+		R49 = (1 + self._column('d49') / 1000) * R49_wg
+
+		D17O = self._column('D17O')
+		d13C_VPDB, d18O_VSMOW = self.compute_bulk_delta(R45, R46, D17O = D17O)
+		R13 = (1 + d13C_VPDB / 1000) * self.R13_VPDB
+		R18 = (1 + d18O_VSMOW / 1000) * self.R18_VSMOW
+
+		# Compute stochastic isobar ratios of the analytes
+		R45stoch, R46stoch, R47stoch, R48stoch, R49stoch = self.compute_isobar_ratios(R13, R18, D17O = D17O)
+
+		# Check that R45/R45stoch and R46/R46stoch are undistinguishable from 1,
+		# and raise a warning if the corresponding anomalies exceed 0.02 ppm.
+		x45 = R45 / R45stoch - 1
+		x46 = R46 / R46stoch - 1
+		for i in np.flatnonzero((x45 > 5e-8) | (x46 > 5e-8)):
+			if x45[i] > 5e-8:
+				self.vmsg(f'This is unexpected: R45/R45stoch - 1 = {1e6 * x45[i]:.3f} ppm')
+			if x46[i] > 5e-8:
+				self.vmsg(f'This is unexpected: R46/R46stoch - 1 = {1e6 * x46[i]:.3f} ppm')
+
+		self._set_column('d13C_VPDB', d13C_VPDB)
+		self._set_column('d18O_VSMOW', d18O_VSMOW)
+
+		# Compute raw clumped isotope anomalies
+		self._set_column('D47raw', 1000 * (R47 / R47stoch - 1))
+		self._set_column('D48raw', 1000 * (R48 / R48stoch - 1))
+		self._set_column('D49raw', 1000 * (R49 / R49stoch - 1))
+
 		self.standardize_d13C()
 		self.standardize_d18O()
 		self.msg(f"Crunched {len(self)} analyses.")
@@ -1367,33 +1569,14 @@ class D4xdata(list):
 		# Compute R17
 		R17 = self.R17_VSMOW * np.exp(D17O / 1000) * (R18 / self.R18_VSMOW) ** self.LAMBDA_17
 
-		# Compute isotope concentrations
-		C12 = (1 + R13) ** -1
-		C13 = C12 * R13
-		C16 = (1 + R17 + R18) ** -1
-		C17 = C16 * R17
-		C18 = C16 * R18
-
-		# Compute stochastic isotopologue concentrations
-		C626 = C16 * C12 * C16
-		C627 = C16 * C12 * C17 * 2
-		C628 = C16 * C12 * C18 * 2
-		C636 = C16 * C13 * C16
-		C637 = C16 * C13 * C17 * 2
-		C638 = C16 * C13 * C18 * 2
-		C727 = C17 * C12 * C17
-		C728 = C17 * C12 * C18 * 2
-		C737 = C17 * C13 * C17
-		C738 = C17 * C13 * C18 * 2
-		C828 = C18 * C12 * C18
-		C838 = C18 * C13 * C18
-
-		# Compute stochastic isobar ratios
-		R45 = (C636 + C627) / C626
-		R46 = (C628 + C637 + C727) / C626
-		R47 = (C638 + C728 + C737) / C626
-		R48 = (C738 + C828) / C626
-		R49 = C838 / C626
+		# Compute stochastic isobar ratios, i.e. the sums of stochastic isotopologue
+		# concentrations (C636 + C627 for mass 45, etc.) divided by C626, which simplify
+		# to polynomials in R13, R17 and R18:
+		R45 = R13 + 2 * R17
+		R46 = 2 * R18 + 2 * R13 * R17 + R17 ** 2
+		R47 = 2 * R13 * R18 + 2 * R17 * R18 + R13 * R17 ** 2
+		R48 = 2 * R13 * R17 * R18 + R18 ** 2
+		R49 = R13 * R18 ** 2
 
 		# Account for stochastic anomalies
 		R47 *= 1 + D47 / 1000
@@ -1455,6 +1638,8 @@ class D4xdata(list):
 
 		W = np.zeros((len(vars_new), len(vars_old)))
 		W[:Ns,:Ns] = np.eye(Ns)
+		index_old = {k: i for i,k in enumerate(vars_old)}
+		index_new = {k: i for i,k in enumerate(vars_new)}
 		for u in unknowns_new:
 			splits = sorted({r['Sample'] for r in self if 'Sample_original' in r and r['Sample_original'] == u})
 			if self.grouping == 'by_session':
@@ -1463,7 +1648,7 @@ class D4xdata(list):
 				weights = [1 for s in splits]
 			sw = sum(weights)
 			weights = [w/sw for w in weights]
-			W[vars_new.index(f'D{self._4x}_{pf(u)}'),[vars_old.index(f'D{self._4x}_{pf(s)}') for s in splits]] = weights[:]
+			W[index_new[f'D{self._4x}_{pf(u)}'],[index_old[f'D{self._4x}_{pf(s)}'] for s in splits]] = weights[:]
 
 		CM_new = W @ CM_old @ W.T
 		V = W @ np.array([[VD_old[k]] for k in vars_old])
@@ -1479,8 +1664,13 @@ class D4xdata(list):
 				r['Sample'] = r['Sample_original']
 
 		self.refresh_samples()
-		self.consolidate_samples()
-		self.repeatabilities()
+		# as in consolidate(), gather each column of analyses only once:
+		self._columns = {}
+		try:
+			self.consolidate_samples()
+			self.repeatabilities()
+		finally:
+			self._columns = None
 
 		if tables:
 			self.table_of_analyses()
@@ -1495,16 +1685,15 @@ class D4xdata(list):
 		Otherwise, `TimeTag` is by default equal to the index of each analysis
 		in the dataset and `t` is defined as above.
 		'''
+		t = np.empty(len(self))
 		for session in self.sessions:
 			sdata = self.sessions[session]['data']
 			try:
-				t0 = np.mean([r['TimeTag'] for r in sdata])
-				for r in sdata:
-					r['t'] = r['TimeTag'] - t0
+				T = np.fromiter((r['TimeTag'] for r in sdata), dtype = float, count = len(sdata))
 			except KeyError:
-				t0 = (len(sdata)-1)/2
-				for t,r in enumerate(sdata):
-					r['t'] = t - t0
+				T = np.arange(len(sdata), dtype = float)
+			t[self._session_mask[session]] = T - np.mean(T)
+		self._set_column('t', t)
 
 
 	def report(self):
@@ -1544,7 +1733,7 @@ class D4xdata(list):
 		groups = sorted(sample_groups.keys())
 		group_total_weights = {k: sum([self.samples[s]['N'] for s in sample_groups[k]]) for k in groups}
 		D4x_old = np.array([[self.samples[x][f'D{self._4x}']] for x in samples])
-		CM_old = np.array([[self.sample_D4x_covar(x,y) for x in samples] for y in samples])
+		CM_old = self._sample_D4x_covar_matrix(samples)
 		W = np.array([
 			[self.samples[i]['N']/group_total_weights[j] if i in sample_groups[j] else 0 for i in samples]
 			for j in groups])
@@ -1626,57 +1815,86 @@ class D4xdata(list):
 			for k in constraints:
 				params[k].expr = constraints[k]
 
+			# parameter names used by each session and by each sample, formatted once
+			# rather than for each analysis at every iteration:
+			D4xraw, d4x, wD4xraw = f'D{self._4x}raw', f'd{self._4x}', f'wD{self._4x}raw'
+			session_pnames = [[f'{q}_{pf(session)}' for q in ['a', 'b', 'c', 'a2', 'b2', 'c2']] for session in self.sessions]
+			sample_pnames = [None if sample in self.anchors else f'D{self._4x}_{pf(sample)}' for sample in self.samples]
+
+			def positions(index, default):
+				# for each analysis, the positions given by `index` of its a, b, c, a2, b2, c2 and D4x
+				# parameters (or `default` for anchors and for parameters which are not in `index`):
+				S = np.array([[index.get(k, default) for k in kk] for kk in session_pnames], dtype = int).reshape((-1, 6))
+				U = np.array([default if k is None else index.get(k, default) for k in sample_pnames], dtype = int)
+				return np.vstack((S[self._session_index].T, U[self._sample_index]))
+
+			# position in `params` of the parameters used by each analysis, so that the model
+			# may be evaluated over all analyses at once (anchors point to a dummy position):
+			pindex = {k: j for j,k in enumerate(params)}
+			ip = positions(pindex, 0)
+			# nominal D4x values of anchors, gathered per sample rather than per analysis:
+			X_anchors = np.array([self.Nominal_D4x.get(sample, np.nan) for sample in self.samples])[self._sample_index]
+			R = self._column(D4xraw)
+			d = self._column(d4x)
+			t = self._column('t')
+			w = self._column(wD4xraw)
+
+			def model_params(p):
+				pv = np.fromiter(p.valuesdict().values(), dtype = float, count = len(pindex))
+				a, b, c, a2, b2, c2, D = pv[ip]
+				return np.where(self._anchor_mask, X_anchors, D), a, b, c, a2, b2, c2
+
 			def residuals(p):
-				R = []
-				for r in self:
-					session = pf(r['Session'])
-					sample = pf(r['Sample'])
-					if r['Sample'] in self.Nominal_D4x:
-						R += [ (
-							r[f'D{self._4x}raw'] - (
-								p[f'a_{session}'] * self.Nominal_D4x[r['Sample']]
-								+ p[f'b_{session}'] * r[f'd{self._4x}']
-								+	p[f'c_{session}']
-								+ r['t'] * (
-									p[f'a2_{session}'] * self.Nominal_D4x[r['Sample']]
-									+ p[f'b2_{session}'] * r[f'd{self._4x}']
-									+	p[f'c2_{session}']
-									)
-								)
-							) / r[f'wD{self._4x}raw'] ]
-					else:
-						R += [ (
-							r[f'D{self._4x}raw'] - (
-								p[f'a_{session}'] * p[f'D{self._4x}_{sample}']
-								+ p[f'b_{session}'] * r[f'd{self._4x}']
-								+	p[f'c_{session}']
-								+ r['t'] * (
-									p[f'a2_{session}'] * p[f'D{self._4x}_{sample}']
-									+ p[f'b2_{session}'] * r[f'd{self._4x}']
-									+	p[f'c2_{session}']
-									)
-								)
-							) / r[f'wD{self._4x}raw'] ]
-				return R
+				X, a, b, c, a2, b2, c2 = model_params(p)
+				return (R - (a * X + b * d + c + t * (a2 * X + b2 * d + c2))) / w
+
+			if constraints:
+				# arbitrary constraints: let lmfit estimate the Jacobian numerically
+				jacobian = '2-point'
+			else:
+				# the model is linear in each parameter, so the Jacobian is known analytically
+				var_index = {k: j for j,k in enumerate([k for k in params if params[k].vary])}
+				cols = dict(zip(['a', 'b', 'c', 'a2', 'b2', 'c2', 'D'], positions(var_index, -1)))
+
+				# derivatives which do not depend on parameter values (i.e., all of them except
+				# those relative to a, a2 for unknowns, and to unknown D4x values) are computed once:
+				J0 = np.zeros((len(self), len(var_index)))
+				for q, dRdq, m in [
+					('a', -X_anchors / w, self._anchor_mask),
+					('b', -d / w, True),
+					('c', -1 / w, True),
+					('a2', -X_anchors * t / w, self._anchor_mask),
+					('b2', -d * t / w, True),
+					('c2', -t / w, True),
+					]:
+					m = np.flatnonzero(m & (cols[q] >= 0))
+					J0[m, cols[q][m]] = dRdq[m]
+
+				m = {
+					q: np.flatnonzero(~self._anchor_mask & (cols[q] >= 0))
+					for q in ['a', 'a2', 'D']
+					}
+
+				def jacobian(p):
+					X, a, b, c, a2, b2, c2 = model_params(p)
+					J = J0.copy()
+					J[m['a'], cols['a'][m['a']]] = (-X / w)[m['a']]
+					J[m['a2'], cols['a2'][m['a2']]] = (-X * t / w)[m['a2']]
+					J[m['D'], cols['D'][m['D']]] = (-(a + a2 * t) / w)[m['D']]
+					return J
 
 			M = Minimizer(residuals, params)
-			result = M.least_squares()
+			result = M.least_squares(jac = jacobian)
+			# drop the reference to the local jacobian so that the result remains picklable:
+			result.call_kws.pop('jac', None)
 			self.Nf = result.nfree
-			self.t95 = tstudent.ppf(1 - 0.05/2, self.Nf)
+			self.t95 = _t95(self.Nf)
 			new_names, new_covar, new_se = _fullcovar(result)[:3]
 			result.var_names = new_names
 			result.covar = new_covar
 
-			for r in self:
-				s = pf(r["Session"])
-				a = result.params.valuesdict()[f'a_{s}']
-				b = result.params.valuesdict()[f'b_{s}']
-				c = result.params.valuesdict()[f'c_{s}']
-				a2 = result.params.valuesdict()[f'a2_{s}']
-				b2 = result.params.valuesdict()[f'b2_{s}']
-				c2 = result.params.valuesdict()[f'c2_{s}']
-				r[f'D{self._4x}'] = (r[f'D{self._4x}raw'] - c - b * r[f'd{self._4x}'] - c2 * r['t'] - b2 * r['t'] * r[f'd{self._4x}']) / (a + a2 * r['t'])
-				
+			X, a, b, c, a2, b2, c2 = model_params(result.params)
+			self._set_column(f'D{self._4x}', (R - c - b * d - c2 * t - b2 * t * d) / (a + a2 * t))
 
 			self.standardization = result
 
@@ -1693,6 +1911,9 @@ class D4xdata(list):
 
 		elif method == 'indep_sessions':
 
+			D4x, D4xraw, d4x = f'D{self._4x}', f'D{self._4x}raw', f'd{self._4x}'
+			wD4x, wD4xraw = f'wD{self._4x}', f'wD{self._4x}raw'
+
 			if weighted_sessions:
 				for session_group in weighted_sessions:
 					X = D4xdata([r for r in self if r['Session'] in session_group], mass = self._4x)
@@ -1704,30 +1925,38 @@ class D4xdata(list):
 			else:
 				self.msg('All weights set to 1 ‰')
 				for r in self:
-					r[f'wD{self._4x}raw'] = 1
+					r[wD4xraw] = 1
+
+			Dn = np.array([self.Nominal_D4x.get(sample, np.nan) for sample in self.samples])[self._sample_index]
+			Draw = self._column(D4xraw)
+			d = self._column(d4x)
+			t = self._column('t')
+			wraw = self._column(wD4xraw)
+			D4x_values = np.empty(len(self))
+			wD4x_values = np.empty(len(self))
 
 			for session in self.sessions:
 				s = self.sessions[session]
 				p_names = ['a', 'b', 'c', 'a2', 'b2', 'c2']
 				p_active = [True, True, True, s['scrambling_drift'], s['slope_drift'], s['wg_drift']]
 				s['Np'] = sum(p_active)
-				sdata = s['data']
-
-				A = np.array([
-					[
-						self.Nominal_D4x[r['Sample']] / r[f'wD{self._4x}raw'],
-						r[f'd{self._4x}'] / r[f'wD{self._4x}raw'],
-						1 / r[f'wD{self._4x}raw'],
-						self.Nominal_D4x[r['Sample']] * r['t'] / r[f'wD{self._4x}raw'],
-						r[f'd{self._4x}'] * r['t'] / r[f'wD{self._4x}raw'],
-						r['t'] / r[f'wD{self._4x}raw']
-						]
-					for r in sdata if r['Sample'] in self.anchors
+				m = self._session_mask[session] & self._anchor_mask
+
+				A = np.column_stack([
+					Dn[m] / wraw[m],
+					d[m] / wraw[m],
+					1 / wraw[m],
+					Dn[m] * t[m] / wraw[m],
+					d[m] * t[m] / wraw[m],
+					t[m] / wraw[m],
 					])[:,p_active] # only keep columns for the active parameters
-				Y = np.array([[r[f'D{self._4x}raw'] / r[f'wD{self._4x}raw']] for r in sdata if r['Sample'] in self.anchors])
+				Y = (Draw[m] / wraw[m])[:,None]
 				s['Na'] = Y.size
-				CM = linalg.inv(A.T @ A)
-				bf = (CM @ A.T @ Y).T[0,:]
+				# solve via QR decomposition rather than forming and inverting A.T @ A
+				Q, R = linalg.qr(A, mode = 'reduced')
+				bf = solve_triangular(R, Q.T @ Y).ravel()
+				Rinv = solve_triangular(R, np.eye(R.shape[0]))
+				CM = Rinv @ Rinv.T
 				k = 0
 				for n,a in zip(p_names, p_active):
 					if a:
@@ -1738,10 +1967,10 @@ class D4xdata(list):
 						s[n] = 0.
 # 						self.msg(f'{n} = 0.0')
 
-				for r in sdata :
-					a, b, c, a2, b2, c2 = s['a'], s['b'], s['c'], s['a2'], s['b2'], s['c2']
-					r[f'D{self._4x}'] = (r[f'D{self._4x}raw'] - c - b * r[f'd{self._4x}'] - c2 * r['t'] - b2 * r['t'] * r[f'd{self._4x}']) / (a + a2 * r['t'])
-					r[f'wD{self._4x}'] = r[f'wD{self._4x}raw'] / (a + a2 * r['t'])
+				a, b, c, a2, b2, c2 = s['a'], s['b'], s['c'], s['a2'], s['b2'], s['c2']
+				m = self._session_mask[session]
+				D4x_values[m] = (Draw[m] - c - b * d[m] - c2 * t[m] - b2 * t[m] * d[m]) / (a + a2 * t[m])
+				wD4x_values[m] = wraw[m] / (a + a2 * t[m])
 
 				s['CM'] = np.zeros((6,6))
 				i = 0
@@ -1751,16 +1980,18 @@ class D4xdata(list):
 						s['CM'][j,k_active] = CM[i,:]
 						i += 1
 
+			self._set_column(D4x, D4x_values)
+			self._set_column(wD4x, wD4x_values)
+
 			if not weighted_sessions:
 				w = self.rmswd()['rmswd']
-				for r in self:
-						r[f'wD{self._4x}'] *= w
-						r[f'wD{self._4x}raw'] *= w
-				for session in self.sessions:
-					self.sessions[session]['CM'] *= w**2
+				self._set_column(wD4x, wD4x_values * w)
+				self._set_column(wD4xraw, wraw * w)
 
 			for session in self.sessions:
 				s = self.sessions[session]
+				if not weighted_sessions:
+					s['CM'] *= w**2
 				s['SE_a'] = s['CM'][0,0]**.5
 				s['SE_b'] = s['CM'][1,1]**.5
 				s['SE_c'] = s['CM'][2,2]**.5
@@ -1775,13 +2006,10 @@ class D4xdata(list):
 				for sg in weighted_sessions:
 					self.Nf += self.rmswd(sessions = sg)['Nf']
 
-			self.t95 = tstudent.ppf(1 - 0.05/2, self.Nf)
+			self.t95 = _t95(self.Nf)
 
-			avgD4x = {
-				sample: np.mean([r[f'D{self._4x}'] for r in self if r['Sample'] == sample])
-				for sample in self.samples
-				}
-			chi2 = np.sum([(r[f'D{self._4x}'] - avgD4x[r['Sample']])**2 for r in self])
+			avgD4x = np.bincount(self._sample_index, weights = D4x_values) / np.bincount(self._sample_index)
+			chi2 = ((D4x_values - avgD4x[self._sample_index])**2).sum()
 			rD4x = (chi2/self.Nf)**.5
 			self.repeatability[f'sigma_{self._4x}'] = rD4x
 
@@ -1793,6 +2021,9 @@ class D4xdata(list):
 		'''
 		Compute standardization error for a given session and
 		(δ47, Δ47) composition.
+
+		`d4x`, `D4x` and `t` may also be arrays (of broadcastable shapes),
+		in which case an array of standardization errors is returned.
 		'''
 		a = self.sessions[session]['a']
 		b = self.sessions[session]['b']
@@ -1813,9 +2044,11 @@ class D4xdata(list):
 		dxda2 = -x * a2 / (a+a2*t)
 		dxdb2 = -y * t / (a+a2*t)
 		dxdc2 = -t / (a+a2*t)
-		V = np.array([dxda, dxdb, dxdc, dxda2, dxdb2, dxdc2])
-		sx = (V @ CM @ V.T) ** .5
-		return sx
+		V = np.array(np.broadcast_arrays(dxda, dxdb, dxdc, dxda2, dxdb2, dxdc2))
+		if V.ndim > 1:
+			# grid of compositions: let BLAS contract CM with V before the element-wise product
+			return (V * np.tensordot(CM, V, axes = 1)).sum(0) ** .5
+		return (V @ CM @ V) ** .5
 
 
 	@make_verbal
@@ -1838,7 +2071,8 @@ class D4xdata(list):
 
 		out = []
 		out += [['N samples (anchors + unknowns)', f"{len(self.samples)} ({len(self.anchors)} + {len(self.unknowns)})"]]
-		out += [['N analyses (anchors + unknowns)', f"{len(self)} ({len([r for r in self if r['Sample'] in self.anchors])} + {len([r for r in self if r['Sample'] in self.unknowns])})"]]
+		Na = int(self._anchor_mask.sum())
+		out += [['N analyses (anchors + unknowns)', f"{len(self)} ({Na} + {len(self) - Na})"]]
 		out += [['Repeatability of δ13C_VPDB', f"{1000 * self.repeatability['r_d13C_VPDB']:.1f} ppm"]]
 		out += [['Repeatability of δ18O_VSMOW', f"{1000 * self.repeatability['r_d18O_VSMOW']:.1f} ppm"]]
 		out += [[f'Repeatability of Δ{self._4x} (anchors)', f"{1000 * self.repeatability[f'r_D{self._4x}a']:.1f} ppm"]]
@@ -1959,30 +2193,23 @@ class D4xdata(list):
 		    (e.g., `[['header1', 'header2'], ['0.1', '0.2']]`)
 		'''
 
-		out = [['UID','Session','Sample']]
-		extra_fields = [f for f in [('SampleMass','.2f'),('ColdFingerPressure','.1f'),('AcidReactionYield','.3f')] if f[0] in {k for r in self for k in r}]
-		for f in extra_fields:
-			out[-1] += [f[0]]
-		out[-1] += ['d13Cwg_VPDB','d18Owg_VSMOW','d45','d46','d47','d48','d49','d13C_VPDB','d18O_VSMOW','D47raw','D48raw','D49raw',f'D{self._4x}']
-		for r in self:
-			out += [[f"{r['UID']}",f"{r['Session']}",f"{r['Sample']}"]]
-			for f in extra_fields:
-				out[-1] += [f"{r[f[0]]:{f[1]}}"]
-			out[-1] += [
-				f"{r['d13Cwg_VPDB']:.3f}",
-				f"{r['d18Owg_VSMOW']:.3f}",
-				f"{r['d45']:.6f}",
-				f"{r['d46']:.6f}",
-				f"{r['d47']:.6f}",
-				f"{r['d48']:.6f}",
-				f"{r['d49']:.6f}",
-				f"{r['d13C_VPDB']:.6f}",
-				f"{r['d18O_VSMOW']:.6f}",
-				f"{r['D47raw']:.6f}",
-				f"{r['D48raw']:.6f}",
-				f"{r['D49raw']:.6f}",
-				f"{r[f'D{self._4x}']:.6f}"
-				]
+		extra_fields = [f for f in [('SampleMass','.2f'),('ColdFingerPressure','.1f'),('AcidReactionYield','.3f')] if any(f[0] in r for r in self)]
+		fields = [('UID', ''), ('Session', ''), ('Sample', '')] + extra_fields + [
+			('d13Cwg_VPDB', '.3f'),
+			('d18Owg_VSMOW', '.3f'),
+			('d45', '.6f'),
+			('d46', '.6f'),
+			('d47', '.6f'),
+			('d48', '.6f'),
+			('d49', '.6f'),
+			('d13C_VPDB', '.6f'),
+			('d18O_VSMOW', '.6f'),
+			('D47raw', '.6f'),
+			('D48raw', '.6f'),
+			('D49raw', '.6f'),
+			(f'D{self._4x}', '.6f'),
+			]
+		out = [[k for k, _ in fields]] + [[format(r[k], spec) for k, spec in fields] for r in self]
 		if save_to_file:
 			if not os.path.exists(dir):
 				os.makedirs(dir)
@@ -2019,14 +2246,16 @@ class D4xdata(list):
 		    (e.g., `[['header1', 'header2'], ['0.1', '0.2']]`)
 		'''
 		samples = sorted([u for u in self.unknowns])
+		if correl:
+			CM = self._sample_D4x_correl_matrix(samples)
+		else:
+			CM = self._sample_D4x_covar_matrix(samples)
 		out = [[''] + samples]
-		for s1 in samples:
-			out.append([s1])
-			for s2 in samples:
-				if correl:
-					out[-1].append(f'{self.sample_D4x_correl(s1, s2):.6f}')
-				else:
-					out[-1].append(f'{self.sample_D4x_covar(s1, s2):.8e}')
+		for s1, row in zip(samples, CM):
+			if correl:
+				out.append([s1] + [f'{x:.6f}' for x in row])
+			else:
+				out.append([s1] + [f'{x:.8e}' for x in row])
 
 		if save_to_file:
 			if not os.path.exists(dir):
@@ -2105,7 +2334,19 @@ class D4xdata(list):
 			return pretty_table(out)
 
 
-	def plot_sessions(self, dir = 'output', figsize = (8,8), filetype = 'pdf', dpi = 100):
+	def _constant_xylimits(self):
+		'''
+		Return the plot limits `[x1, x2, y1, y2]` which span the δ4x and Δ4x values
+		of all analyses, with 5 % margins (used for `xylimits = 'constant'`)
+		'''
+		x = self._column(f'd{self._4x}')
+		y = self._column(f'D{self._4x}')
+		x1, x2, y1, y2 = np.min(x), np.max(x), np.min(y), np.max(y)
+		w, h = x2-x1, y2-y1
+		return [x1 - w/20, x2 + w/20, y1 - h/20, y2 + h/20]
+
+
+	def plot_sessions(self, dir = 'output', figsize = (8,8), filetype = 'pdf', dpi = 100, max_workers = 1):
 		'''
 		Generate session plots and save them to disk.
 
@@ -2115,15 +2356,58 @@ class D4xdata(list):
 		+ `figsize`: the width and height (in inches) of each plot
 		+ `filetype`: 'pdf' or 'png'
 		+ `dpi`: resolution for PNG output
+		+ `max_workers`: number of worker processes used to render the plots in parallel
+		(by default, plots are rendered sequentially in the current process;
+		if `None`, use `os.cpu_count()` workers). When using more than one worker,
+		scripts calling this method should be protected by an `if __name__ == '__main__':` guard.
 		'''
+		ppl = _pyplot()
 		if not os.path.exists(dir):
 			os.makedirs(dir)
 
-		for session in self.sessions:
-			sp = self.plot_single_session(session, xylimits = 'constant')
-			ppl.savefig(f'{dir}/D{self._4x}_plot_{session}.{filetype}', **({'dpi': dpi} if filetype.lower() == 'png' else {}))
-			ppl.close(sp.fig)
-			
+		savefig_kwargs = {'dpi': dpi} if filetype.lower() == 'png' else {}
+
+		if max_workers is None:
+			max_workers = os.cpu_count()
+
+		# identical for all sessions, so only computed once:
+		xylimits = self._constant_xylimits()
+
+		if max_workers == 1 or len(self.sessions) < 2:
+			for session in self.sessions:
+				sp = self.plot_single_session(session, xylimits = xylimits)
+				ppl.savefig(f'{dir}/D{self._4x}_plot_{session}.{filetype}', **savefig_kwargs)
+				ppl.close(sp.fig)
+			return
+
+		from concurrent.futures import ProcessPoolExecutor
+
+		# each job only needs the analyses of its own session:
+		keys = ['Sample', 'Session', f'd{self._4x}', f'D{self._4x}']
+		records = {
+			session: [{k: r[k] for k in keys} for r in self.sessions[session]['data']]
+			for session in self.sessions
+			}
+		unknowns_D4x = {u: self.unknowns[u][f'D{self._4x}'] for u in self.unknowns}
+		jobs = [
+			(
+				self._4x,
+				self.Nominal_D4x,
+				records[session],
+				session,
+				{k: self.sessions[session][k] for k in ['a', 'b', 'c', 'a2', 'b2', 'c2', 'CM']},
+				unknowns_D4x,
+				xylimits,
+				f'{dir}/D{self._4x}_plot_{session}.{filetype}',
+				savefig_kwargs,
+				)
+			for session in self.sessions
+			]
+		chunksize = max(1, len(jobs) // (max_workers * 4))
+		with ProcessPoolExecutor(max_workers = max_workers) as executor:
+			for _ in executor.map(_render_session, jobs, chunksize = chunksize):
+				pass
+
 
 
 	@make_verbal
@@ -2151,25 +2435,39 @@ class D4xdata(list):
 		variance, indicating whether the Δ4x repeatability this sample differs significantly from
 		that observed for the reference sample specified by `self.LEVENE_REF_SAMPLE`.
 		'''
-		D4x_ref_pop = [r[f'D{self._4x}'] for r in self.samples[self.LEVENE_REF_SAMPLE]['data']]
-		for sample in self.samples:
-			self.samples[sample]['N'] = len(self.samples[sample]['data'])
-			if self.samples[sample]['N'] > 1:
-				self.samples[sample][f'SD_D{self._4x}'] = stdev([r[f'D{self._4x}'] for r in self.samples[sample]['data']])
+		# analyses of each sample, as contiguous rows of (D4x, d13C_VPDB, d18O_VSMOW),
+		# from a single stable sort of the analyses by sample:
+		order = np.argsort(self._sample_index, kind = 'stable')
+		X = np.column_stack([self._column(f'D{self._4x}'), self._column('d13C_VPDB'), self._column('d18O_VSMOW')])[order]
+		N = np.bincount(self._sample_index, minlength = len(self.samples))
+		starts = np.cumsum(N) - N
+
+		sample_code = {sample: k for k, sample in enumerate(self.samples)}
+		k = sample_code[self.LEVENE_REF_SAMPLE]
+		D4x_ref_pop = X[starts[k]:starts[k]+N[k], 0]
+
+		# grouped means and (two-pass) standard deviations for all samples at once:
+		means = np.add.reduceat(X, starts, axis = 0) / N[:,None]
+		sqdev = (X[:,0] - means[self._sample_index[order], 0])**2
+		SD = (np.add.reduceat(sqdev, starts) / np.maximum(N - 1, 1))**.5
 
-			self.samples[sample]['d13C_VPDB'] = np.mean([r['d13C_VPDB'] for r in self.samples[sample]['data']])
-			self.samples[sample]['d18O_VSMOW'] = np.mean([r['d18O_VSMOW'] for r in self.samples[sample]['data']])
+		for k, sample in enumerate(self.samples):
+			self.samples[sample]['N'] = int(N[k])
+			if N[k] > 1:
+				self.samples[sample][f'SD_D{self._4x}'] = SD[k]
 
-			D4x_pop = [r[f'D{self._4x}'] for r in self.samples[sample]['data']]
-			if len(D4x_pop) > 2:
-				self.samples[sample]['p_Levene'] = levene(D4x_ref_pop, D4x_pop, center = 'median')[1]
+			self.samples[sample]['d13C_VPDB'], self.samples[sample]['d18O_VSMOW'] = means[k,1:]
+
+			if N[k] > 2:
+				self.samples[sample]['p_Levene'] = levene(D4x_ref_pop, X[starts[k]:starts[k]+N[k], 0], center = 'median')[1]
 			
 		if self.standardization_method == 'pooled':
 			for sample in self.anchors:
 				self.samples[sample][f'D{self._4x}'] = self.Nominal_D4x[sample]
 				self.samples[sample][f'SE_D{self._4x}'] = 0.
+			pv = self.standardization.params.valuesdict()
 			for sample in self.unknowns:
-				self.samples[sample][f'D{self._4x}'] = self.standardization.params.valuesdict()[f'D{self._4x}_{pf(sample)}']
+				self.samples[sample][f'D{self._4x}'] = pv[f'D{self._4x}_{pf(sample)}']
 				try:
 					self.samples[sample][f'SE_D{self._4x}'] = self.sample_D4x_covar(sample)**.5
 				except ValueError:
@@ -2182,29 +2480,45 @@ class D4xdata(list):
 			for sample in self.anchors:
 				self.samples[sample][f'D{self._4x}'] = self.Nominal_D4x[sample]
 				self.samples[sample][f'SE_D{self._4x}'] = 0.
-			for sample in self.unknowns:
+			unknowns = list(self.unknowns)
+			sessions = list(self.sessions)
+			unknown_index = {u: i for i,u in enumerate(unknowns)}
+			avg_D4x = np.zeros((len(unknowns), len(sessions)))
+			sigma = np.ones((len(unknowns), len(sessions)))
+			found = np.zeros((len(unknowns), len(sessions)), dtype = bool)
+			D4x_col = self._column(f'D{self._4x}')
+			d4x_col = self._column(f'd{self._4x}')
+			wD4xraw_col = self._column(f'wD{self._4x}raw')
+			for j, session in enumerate(sessions):
+				sunknowns = [u for u in unknowns if (u, session) in self._rows_by_sample_session]
+				if sunknowns:
+					rows = [self._rows_by_sample_session[(u, session)] for u in sunknowns]
+					i = [unknown_index[u] for u in sunknowns]
+					found[i,j] = True
+					avg_D4x[i,j] = [np.mean(D4x_col[k]) for k in rows]
+					avg_d4x = np.array([np.mean(d4x_col[k]) for k in rows])
+					# !! TODO: sigma_s below does not account for temporal changes in standardization error
+					sigma_s = self.standardization_error(session, avg_d4x, avg_D4x[i,j])
+					sigma_u = np.array([wD4xraw_col[k[0]] / len(k)**.5 for k in rows]) / self.sessions[session]['a']
+					sigma[i,j] = (sigma_u**2 + sigma_s**2)**.5
+
+			# variance-weighted averages over all sessions, for all unknowns at once
+			weights = np.where(found, sigma**-2, 0.)
+			wsum = weights.sum(1)
+			D4x = (weights * avg_D4x).sum(1) / wsum
+			SE_D4x = wsum**-.5
+
+			for i, sample in enumerate(unknowns):
 				self.msg(f'Consolidating sample {sample}')
 				self.unknowns[sample][f'session_D{self._4x}'] = {}
-				session_avg = []
-				for session in self.sessions:
-					sdata = [r for r in self.sessions[session]['data'] if r['Sample'] == sample]
-					if sdata:
+				for j, session in enumerate(sessions):
+					if found[i,j]:
 						self.msg(f'{sample} found in session {session}')
-						avg_D4x = np.mean([r[f'D{self._4x}'] for r in sdata])
-						avg_d4x = np.mean([r[f'd{self._4x}'] for r in sdata])
-						# !! TODO: sigma_s below does not account for temporal changes in standardization error
-						sigma_s = self.standardization_error(session, avg_d4x, avg_D4x)
-						sigma_u = sdata[0][f'wD{self._4x}raw'] / self.sessions[session]['a'] / len(sdata)**.5
-						session_avg.append([avg_D4x, (sigma_u**2 + sigma_s**2)**.5])
-						self.unknowns[sample][f'session_D{self._4x}'][session] = session_avg[-1]
-				self.samples[sample][f'D{self._4x}'], self.samples[sample][f'SE_D{self._4x}'] = w_avg(*zip(*session_avg))
-				weights = {s: self.unknowns[sample][f'session_D{self._4x}'][s][1]**-2 for s in self.unknowns[sample][f'session_D{self._4x}']}
-				wsum = sum([weights[s] for s in weights])
-				for s in weights:
-					self.unknowns[sample][f'session_D{self._4x}'][s] += [self.unknowns[sample][f'session_D{self._4x}'][s][1]**-2 / wsum]
+						self.unknowns[sample][f'session_D{self._4x}'][session] = [avg_D4x[i,j], sigma[i,j], weights[i,j] / wsum[i]]
+				self.samples[sample][f'D{self._4x}'], self.samples[sample][f'SE_D{self._4x}'] = D4x[i], SE_D4x[i]
 
-		for r in self:
-			r[f'D{self._4x}_residual'] = r[f'D{self._4x}'] - self.samples[r['Sample']][f'D{self._4x}']
+		D4x_samples = np.array([self.samples[sample][f'D{self._4x}'] for sample in self.samples])
+		self._set_column(f'D{self._4x}_residual', self._column(f'D{self._4x}') - D4x_samples[self._sample_index])
 
 
 
@@ -2239,8 +2553,9 @@ class D4xdata(list):
 				self.sessions[session]['d13Cwg_VPDB'] = self.sessions[session]['data'][0]['d13Cwg_VPDB']
 			if 'd18Owg_VSMOW' not in self.sessions[session]:
 				self.sessions[session]['d18Owg_VSMOW'] = self.sessions[session]['data'][0]['d18Owg_VSMOW']
-			self.sessions[session]['Na'] = len([r for r in self.sessions[session]['data'] if r['Sample'] in self.anchors])
-			self.sessions[session]['Nu'] = len([r for r in self.sessions[session]['data'] if r['Sample'] in self.unknowns])
+			smask = self._session_mask[session]
+			self.sessions[session]['Na'] = int(self._anchor_mask[smask].sum())
+			self.sessions[session]['Nu'] = int(smask.sum()) - self.sessions[session]['Na']
 
 			self.msg(f'Computing repeatabilities for session {session}')
 			self.sessions[session]['r_d13C_VPDB'] = self.compute_r('d13C_VPDB', samples = 'anchors', sessions = [session])
@@ -2248,86 +2563,37 @@ class D4xdata(list):
 			self.sessions[session][f'r_D{self._4x}'] = self.compute_r(f'D{self._4x}', sessions = [session])
 
 		if self.standardization_method == 'pooled':
+			pv = self.standardization.params.valuesdict()
+			var_index = self._var_positions()
+			covar = self.standardization.covar
+			# standard errors of all fitted parameters:
+			SE = np.diag(covar)**.5
+			D4x = self._column(f'D{self._4x}')
+			D4x_samples = np.array([self.samples[sample][f'D{self._4x}'] for sample in self.samples])
+			sqresiduals = (D4x - D4x_samples[self._sample_index])**2
 			for session in self.sessions:
 
 				# different (better?) computation of D4x repeatability for each session:
-				sqresiduals = [(r[f'D{self._4x}'] - self.samples[r['Sample']][f'D{self._4x}'])**2 for r in self.sessions[session]['data']]
-				self.sessions[session][f'r_D{self._4x}'] = np.mean(sqresiduals)**.5
-
-				self.sessions[session]['a'] = self.standardization.params.valuesdict()[f'a_{pf(session)}']
-				i = self.standardization.var_names.index(f'a_{pf(session)}')
-				self.sessions[session]['SE_a'] = self.standardization.covar[i,i]**.5
+				self.sessions[session][f'r_D{self._4x}'] = np.mean(sqresiduals[self._session_mask[session]])**.5
 
-				self.sessions[session]['b'] = self.standardization.params.valuesdict()[f'b_{pf(session)}']
-				i = self.standardization.var_names.index(f'b_{pf(session)}')
-				self.sessions[session]['SE_b'] = self.standardization.covar[i,i]**.5
+				keys = {q: f'{q}_{pf(session)}' for q in ['a', 'b', 'c', 'a2', 'b2', 'c2']}
 
-				self.sessions[session]['c'] = self.standardization.params.valuesdict()[f'c_{pf(session)}']
-				i = self.standardization.var_names.index(f'c_{pf(session)}')
-				self.sessions[session]['SE_c'] = self.standardization.covar[i,i]**.5
+				for q in ['a', 'b', 'c']:
+					self.sessions[session][q] = pv[keys[q]]
+					self.sessions[session][f'SE_{q}'] = SE[var_index[keys[q]]]
 
-				self.sessions[session]['a2'] = self.standardization.params.valuesdict()[f'a2_{pf(session)}']
-				if self.sessions[session]['scrambling_drift']:
-					i = self.standardization.var_names.index(f'a2_{pf(session)}')
-					self.sessions[session]['SE_a2'] = self.standardization.covar[i,i]**.5
-				else:
-					self.sessions[session]['SE_a2'] = 0.
-
-				self.sessions[session]['b2'] = self.standardization.params.valuesdict()[f'b2_{pf(session)}']
-				if self.sessions[session]['slope_drift']:
-					i = self.standardization.var_names.index(f'b2_{pf(session)}')
-					self.sessions[session]['SE_b2'] = self.standardization.covar[i,i]**.5
-				else:
-					self.sessions[session]['SE_b2'] = 0.
-
-				self.sessions[session]['c2'] = self.standardization.params.valuesdict()[f'c2_{pf(session)}']
-				if self.sessions[session]['wg_drift']:
-					i = self.standardization.var_names.index(f'c2_{pf(session)}')
-					self.sessions[session]['SE_c2'] = self.standardization.covar[i,i]**.5
-				else:
-					self.sessions[session]['SE_c2'] = 0.
+				for q, drift in [('a2', 'scrambling_drift'), ('b2', 'slope_drift'), ('c2', 'wg_drift')]:
+					self.sessions[session][q] = pv[keys[q]]
+					if self.sessions[session][drift]:
+						self.sessions[session][f'SE_{q}'] = SE[var_index[keys[q]]]
+					else:
+						self.sessions[session][f'SE_{q}'] = 0.
 
-				i = self.standardization.var_names.index(f'a_{pf(session)}')
-				j = self.standardization.var_names.index(f'b_{pf(session)}')
-				k = self.standardization.var_names.index(f'c_{pf(session)}')
+				# covariance of (a, b, c, a2, b2, c2), with zeros for parameters which are not fitted:
+				fitted = [k for k,q in enumerate(keys) if keys[q] in var_index]
+				i = [var_index[keys[q]] for q in keys if keys[q] in var_index]
 				CM = np.zeros((6,6))
-				CM[:3,:3] = self.standardization.covar[[i,j,k],:][:,[i,j,k]]
-				try:
-					i2 = self.standardization.var_names.index(f'a2_{pf(session)}')
-					CM[3,[0,1,2,3]] = self.standardization.covar[i2,[i,j,k,i2]]
-					CM[[0,1,2,3],3] = self.standardization.covar[[i,j,k,i2],i2]
-					try:
-						j2 = self.standardization.var_names.index(f'b2_{pf(session)}')
-						CM[3,4] = self.standardization.covar[i2,j2]
-						CM[4,3] = self.standardization.covar[j2,i2]
-					except ValueError:
-						pass
-					try:
-						k2 = self.standardization.var_names.index(f'c2_{pf(session)}')
-						CM[3,5] = self.standardization.covar[i2,k2]
-						CM[5,3] = self.standardization.covar[k2,i2]
-					except ValueError:
-						pass
-				except ValueError:
-					pass
-				try:
-					j2 = self.standardization.var_names.index(f'b2_{pf(session)}')
-					CM[4,[0,1,2,4]] = self.standardization.covar[j2,[i,j,k,j2]]
-					CM[[0,1,2,4],4] = self.standardization.covar[[i,j,k,j2],j2]
-					try:
-						k2 = self.standardization.var_names.index(f'c2_{pf(session)}')
-						CM[4,5] = self.standardization.covar[j2,k2]
-						CM[5,4] = self.standardization.covar[k2,j2]
-					except ValueError:
-						pass
-				except ValueError:
-					pass
-				try:
-					k2 = self.standardization.var_names.index(f'c2_{pf(session)}')
-					CM[5,[0,1,2,5]] = self.standardization.covar[k2,[i,j,k,k2]]
-					CM[[0,1,2,5],5] = self.standardization.covar[[i,j,k,k2],k2]
-				except ValueError:
-					pass
+				CM[np.ix_(fitted, fitted)] = covar[np.ix_(i, i)]
 
 				self.sessions[session]['CM'] = CM
 
@@ -2351,13 +2617,24 @@ class D4xdata(list):
 
 
 	@make_verbal
-	def consolidate(self, tables = True, plots = True):
+	def consolidate(self, tables = True, plots = True, max_workers = 1):
 		'''
 		Collect information about samples, sessions and repeatabilities.
+
+		**Parameters**
+
+		+ `tables`: whether to print out and save the tables of sessions, analyses and samples
+		+ `plots`: whether to generate session plots
+		+ `max_workers`: number of worker processes used to render session plots in parallel
+		(see `D4xdata.plot_sessions()`)
 		'''
-		self.consolidate_samples()
-		self.consolidate_sessions()
-		self.repeatabilities()
+		self._columns = {}
+		try:
+			self.consolidate_samples()
+			self.consolidate_sessions()
+			self.repeatabilities()
+		finally:
+			self._columns = None
 
 		if tables:
 			self.summary()
@@ -2366,7 +2643,19 @@ class D4xdata(list):
 			self.table_of_samples()
 
 		if plots:
-			self.plot_sessions()
+			self.plot_sessions(max_workers = max_workers)
+
+
+	def _selected(self, samples, sessions):
+		'''
+		Return a boolean mask of the analyses of `samples` within `sessions`.
+		'''
+		# set membership tests rather than list scans:
+		sample_set, session_set = frozenset(samples), frozenset(sessions)
+		# select analyses by looking up their sample and session codes in boolean tables:
+		G = np.array([s in sample_set for s in self.samples], dtype = bool)[self._sample_index]
+		G &= np.array([s in session_set for s in self.sessions], dtype = bool)[self._session_index]
+		return G
 
 
 	@make_verbal
@@ -2382,24 +2671,30 @@ class D4xdata(list):
 		Only used in `D4xdata.standardize()` with `method='indep_sessions'`.
 		'''
 		if samples == 'all samples':
-			mysamples = [k for k in self.samples]
+			mysamples = self.samples
 		elif samples == 'anchors':
-			mysamples = [k for k in self.anchors]
+			mysamples = self.anchors
 		elif samples == 'unknowns':
-			mysamples = [k for k in self.unknowns]
+			mysamples = self.unknowns
 		else:
 			mysamples = samples
 
 		if sessions == 'all sessions':
-			sessions = [k for k in self.sessions]
-
-		chisq, Nf = 0, 0
-		for sample in mysamples :
-			G = [ r for r in self if r['Sample'] == sample and r['Session'] in sessions ]
-			if len(G) > 1 :
-				X, sX = w_avg([r[f'D{self._4x}'] for r in G], [r[f'wD{self._4x}'] for r in G])
-				Nf += (len(G) - 1)
-				chisq += np.sum([ ((r[f'D{self._4x}']-X)/r[f'wD{self._4x}'])**2 for r in G])
+			sessions = self.sessions
+
+		G = self._selected(mysamples, sessions)
+		D4x = self._column(f'D{self._4x}')[G]
+		wD4x = self._column(f'wD{self._4x}')[G]
+		# variance-weighted average of each sample (as in `w_avg()`), for all samples at once:
+		gid = self._sample_index[G]
+		N = np.bincount(gid, minlength = len(self.samples))
+		W = wD4x**-2
+		sumW = np.bincount(gid, weights = W, minlength = len(self.samples))
+		X = np.bincount(gid, weights = W * D4x, minlength = len(self.samples)) / np.where(N > 0, sumW, 1)
+		sqdev = np.bincount(gid, weights = ((D4x - X[gid]) / wD4x)**2, minlength = len(self.samples))
+		# only samples with more than one analysis contribute:
+		Nf = int((N[N > 1] - 1).sum())
+		chisq = sqdev[N > 1].sum() if Nf else 0
 		r = (chisq / Nf)**.5 if Nf > 0 else 0
 		self.msg(f'RMSWD of r["D{self._4x}"] is {r:.6f} for {samples}.')
 		return {'rmswd': r, 'chisq': chisq, 'Nf': Nf}
@@ -2411,42 +2706,35 @@ class D4xdata(list):
 		Compute the repeatability of `[r[key] for r in self]`
 		'''
 
+		# `self.samples`, `self.anchors`, `self.unknowns` and `self.sessions` are only
+		# iterated over and tested for membership, so they are used as is rather than copied:
 		if samples == 'all samples':
-			mysamples = [k for k in self.samples]
+			mysamples = self.samples
 		elif samples == 'anchors':
-			mysamples = [k for k in self.anchors]
+			mysamples = self.anchors
 		elif samples == 'unknowns':
-			mysamples = [k for k in self.unknowns]
+			mysamples = self.unknowns
 		else:
 			mysamples = samples
 
 		if sessions == 'all sessions':
-			sessions = [k for k in self.sessions]
+			sessions = self.sessions
+
+		G = self._selected(mysamples, sessions)
 
 		if key in ['D47', 'D48']:
 			# Full disclosure: the definition of Nf is tricky/debatable
-			G = [r for r in self if r['Sample'] in mysamples and r['Session'] in sessions]
-			chisq = (np.array([r[f'{key}_residual'] for r in G])**2).sum()
-			Nf = len(G)
+			chisq = (self._column(f'{key}_residual')[G]**2).sum()
+			Nf = int(G.sum())
 # 			print(f'len(G) = {Nf}')
 			Nf -= len([s for s in mysamples if s in self.unknowns])
 # 			print(f'{len([s for s in mysamples if s in self.unknowns])} unknown samples to consider')
+			constrained = self._constrained_params()
+			myanchors = {s for s in mysamples if s in self.anchors}
 			for session in sessions:
-				Np = len([
-					_ for _ in self.standardization.params
-					if (
-						self.standardization.params[_].expr is not None
-						and (
-							(_[0] in 'abc' and _[1] == '_' and _[2:] == pf(session))
-							or (_[0] in 'abc' and _[1:3] == '2_' and _[3:] == pf(session))
-							)
-						)
-					])
+				Np = constrained.get(pf(session), 0)
 # 				print(f'session {session}: {Np} parameters to consider')
-				Na = len({
-					r['Sample'] for r in self.sessions[session]['data']
-					if r['Sample'] in self.anchors and r['Sample'] in mysamples
-					})
+				Na = len(self._samples_by_session.get(session, set()) & myanchors)
 # 				print(f'session {session}: {Na} different anchors in that session')
 				Nf -= min(Np, Na)
 # 			print(f'Nf = {Nf}')
@@ -2464,17 +2752,39 @@ class D4xdata(list):
 			r = (chisq / Nf)**.5 if Nf > 0 else 0
 
 		else: # if key not in ['D47', 'D48']
-			chisq, Nf = 0, 0
-			for sample in mysamples :
-				X = [ r[key] for r in self if r['Sample'] == sample and r['Session'] in sessions ]
-				if len(X) > 1 :
-					Nf += len(X) - 1
-					chisq += np.sum([ (x-np.mean(X))**2 for x in X ])
-			r = (chisq / Nf)**.5 if Nf > 0 else 0
+			# group the selected analyses by sample:
+			X = self._column(key)[G]
+			gid = self._sample_index[G]
+			N = np.bincount(gid, minlength = len(self.samples))
+			if (N > 1).any():
+				means = np.bincount(gid, weights = X, minlength = len(self.samples)) / np.maximum(N, 1)
+				sqdev = np.bincount(gid, weights = (X - means[gid])**2, minlength = len(self.samples))
+				Nf = int((N[N > 1] - 1).sum())
+				chisq = sqdev[N > 1].sum()
+				r = (chisq / Nf)**.5
+			else:
+				# no sample was analyzed more than once
+				r = 0
 
 		self.msg(f'Repeatability of r["{key}"] is {1000*r:.1f} ppm for {samples}.')
 		return r
 
+	def _constrained_params(self):
+		'''
+		Return a `{pf(session): N}` dict of the number of constrained standardization
+		parameters (`a`, `b`, `c`, `a2`, `b2`, `c2`) in each session, which only depends
+		on `self.standardization` and is thus cached until the next standardization.
+		'''
+		if self._constrained is None or self._constrained[0] is not self.standardization:
+			constrained = {}
+			for name, param in self.standardization.params.items():
+				q, _, session_pf = name.partition('_')
+				if q in ['a', 'b', 'c', 'a2', 'b2', 'c2'] and param.expr is not None:
+					constrained[session_pf] = constrained.get(session_pf, 0) + 1
+			self._constrained = (self.standardization, constrained)
+		return self._constrained[1]
+
+
 	def sample_average(self, samples, weights = 'equal', normalize = True):
 		'''
 		Weighted average Δ4x value of a group of samples, accounting for covariance.
@@ -2499,19 +2809,20 @@ class D4xdata(list):
 
 		returns the value and SE of the difference Δ4x(X) - Δ4x(Y).
 		'''
-		if weights == 'equal':
-			weights = [1/len(samples)] * len(samples)
+		if isinstance(weights, str) and weights == 'equal':
+			weights = np.full(len(samples), 1/len(samples))
+		else:
+			weights = np.asarray(weights, dtype = float)
 
 		if normalize:
-			s = sum(weights)
+			s = weights.sum()
 			if s:
-				weights = [w/s for w in weights]
+				weights = weights / s
 
 		try:
-# 			indices = [self.standardization.var_names.index(f'D47_{pf(sample)}') for sample in samples]
-# 			C = self.standardization.covar[indices,:][:,indices]
-			C = np.array([[self.sample_D4x_covar(x, y) for x in samples] for y in samples])
-			X = [self.samples[sample][f'D{self._4x}'] for sample in samples]
+			# gathered in a single step rather than one sample_D4x_covar() call per pair of samples:
+			C = self._sample_D4x_covar_matrix(samples)
+			X = np.array([self.samples[sample][f'D{self._4x}'] for sample in samples])
 			return correlated_sum(X, C, weights)
 		except ValueError:
 			return (0., 0.)
@@ -2528,34 +2839,107 @@ class D4xdata(list):
 		if sample2 is None:
 			sample2 = sample1
 		if self.standardization_method == 'pooled':
-			i = self.standardization.var_names.index(f'D{self._4x}_{pf(sample1)}')
-			j = self.standardization.var_names.index(f'D{self._4x}_{pf(sample2)}')
+			i, j = self._var_indices([f'D{self._4x}_{pf(sample1)}', f'D{self._4x}_{pf(sample2)}'])
 			return self.standardization.covar[i, j]
 		elif self.standardization_method == 'indep_sessions':
 			if sample1 == sample2:
 				return self.samples[sample1][f'SE_D{self._4x}']**2
 			else:
+				D4x, d4x = f'D{self._4x}', f'd{self._4x}'
 				c = 0
 				for session in self.sessions:
-					sdata1 = [r for r in self.sessions[session]['data'] if r['Sample'] == sample1]
-					sdata2 = [r for r in self.sessions[session]['data'] if r['Sample'] == sample2]
-					if sdata1 and sdata2:
+					rows1 = self._rows_by_sample_session.get((sample1, session))
+					rows2 = self._rows_by_sample_session.get((sample2, session))
+					if rows1 is not None and rows2 is not None:
 						a = self.sessions[session]['a']
 						# !! TODO: CM below does not account for temporal changes in standardization parameters
-						CM = self.sessions[session]['CM'][:3,:3]
-						avg_D4x_1 = np.mean([r[f'D{self._4x}'] for r in sdata1])
-						avg_d4x_1 = np.mean([r[f'd{self._4x}'] for r in sdata1])
-						avg_D4x_2 = np.mean([r[f'D{self._4x}'] for r in sdata2])
-						avg_d4x_2 = np.mean([r[f'd{self._4x}'] for r in sdata2])
+						(cm00, cm01, cm02), (_, cm11, cm12), (_, _, cm22) = self.sessions[session]['CM'][:3,:3].tolist()
+						# average D4x and d4x of each sample in this session:
+						D1, d1 = np.array([[self[k][D4x], self[k][d4x]] for k in rows1]).mean(0).tolist()
+						D2, d2 = np.array([[self[k][D4x], self[k][d4x]] for k in rows2]).mean(0).tolist()
+						# quadratic form [D1, d1, 1] @ CM @ [D2, d2, 1], CM being symmetric:
+						q = (
+							cm00 * D1 * D2
+							+ cm01 * (D1 * d2 + d1 * D2)
+							+ cm02 * (D1 + D2)
+							+ cm11 * d1 * d2
+							+ cm12 * (d1 + d2)
+							+ cm22
+							)
 						c += (
 							self.unknowns[sample1][f'session_D{self._4x}'][session][2]
 							* self.unknowns[sample2][f'session_D{self._4x}'][session][2]
-							* np.array([[avg_D4x_1, avg_d4x_1, 1]])
-							@ CM
-							@ np.array([[avg_D4x_2, avg_d4x_2, 1]]).T
+							* q
 							) / a**2
 				return float(c)
 
+	def _var_positions(self):
+		'''
+		Return a `{name: position}` dict of the parameters in `self.standardization.var_names`.
+
+		The dict is cached, and rebuilt whenever `var_names` is replaced (e.g., by `unsplit_samples()`).
+		'''
+		var_names = self.standardization.var_names
+		if self._var_index is None or self._var_index[0] is not var_names:
+			self._var_index = (var_names, {k: i for i,k in enumerate(var_names)})
+		return self._var_index[1]
+
+
+	def _var_indices(self, names):
+		'''
+		Return the positions of parameters `names` in `self.standardization.var_names`.
+
+		As with `list.index()`, raises `ValueError` for parameters which are not
+		in `var_names` (e.g., constrained parameters).
+		'''
+		var_positions = self._var_positions()
+		try:
+			return [var_positions[k] for k in names]
+		except KeyError as e:
+			raise ValueError(f'{e.args[0]!r} is not in var_names') from None
+
+
+	def _sample_D4x_covar_matrix(self, samples):
+		'''
+		Error covariance matrix of the Δ4x values of `samples`, in the same order.
+		'''
+		if self.standardization_method == 'pooled':
+			idx = self._var_indices([f'D{self._4x}_{pf(s)}' for s in samples])
+			return self.standardization.covar[np.ix_(idx, idx)]
+		D4x = self._column(f'D{self._4x}')
+		d4x = self._column(f'd{self._4x}')
+		C = np.zeros((len(samples), len(samples)))
+		for session in self.sessions:
+			w = np.zeros(len(samples))
+			M = np.zeros((len(samples), 3))
+			for i, sample in enumerate(samples):
+				rows = self._rows_by_sample_session.get((sample, session))
+				if rows is not None:
+					w[i] = self.unknowns[sample][f'session_D{self._4x}'][session][2]
+					M[i] = [D4x[rows].mean(), d4x[rows].mean(), 1.]
+			if not w.any():
+				continue
+			# !! TODO: CM below does not account for temporal changes in standardization parameters
+			CM = self.sessions[session]['CM'][:3,:3]
+			C += np.outer(w, w) * (M @ CM @ M.T) / self.sessions[session]['a']**2
+		# the covariance of a sample with itself is its variance, including where
+		# the same sample is listed more than once:
+		first = {}
+		k = np.array([first.setdefault(sample, i) for i, sample in enumerate(samples)])
+		same = k[:,None] == k[None,:]
+		var = np.array([self.samples[sample][f'SE_D{self._4x}']**2 for sample in samples])
+		C[same] = np.broadcast_to(var[:,None], C.shape)[same]
+		return C
+
+	def _sample_D4x_correl_matrix(self, samples):
+		'''
+		Error correlation matrix of the Δ4x values of `samples`, in the same order.
+		'''
+		SE = np.array([self.samples[s][f'SE_D{self._4x}'] for s in samples])
+		correl = self._sample_D4x_covar_matrix(samples) / SE / SE[:,None]
+		np.fill_diagonal(correl, 1.)
+		return correl
+
 	def sample_D4x_correl(self, sample1, sample2 = None):
 		'''
 		Correlation between Δ4x errors of samples
@@ -2586,28 +2970,35 @@ class D4xdata(list):
 		'''
 		Generate plot for a single session
 		'''
+		ppl = _pyplot()
 		if x_label is None:
 			x_label = f'δ$_{{{self._4x}}}$ (‰)'
 		if y_label is None:
 			y_label = f'Δ$_{{{self._4x}}}$ (‰)'
 
 		out = _SessionPlot()
-		anchors = [a for a in self.anchors if [r for r in self.sessions[session]['data'] if r['Sample'] == a]]
-		unknowns = [u for u in self.unknowns if [r for r in self.sessions[session]['data'] if r['Sample'] == u]]
-		anchors_d = [r[f'd{self._4x}'] for r in self.sessions[session]['data'] if r['Sample'] in self.anchors]
-		anchors_D = [r[f'D{self._4x}'] for r in self.sessions[session]['data'] if r['Sample'] in self.anchors]
-		unknowns_d = [r[f'd{self._4x}'] for r in self.sessions[session]['data'] if r['Sample'] in self.unknowns]
-		unknowns_D = [r[f'D{self._4x}'] for r in self.sessions[session]['data'] if r['Sample'] in self.unknowns]
-		anchor_avg = (np.array([ np.array([
-				np.min([r[f'd{self._4x}'] for r in self.sessions[session]['data'] if r['Sample'] == sample]) - 1,
-				np.max([r[f'd{self._4x}'] for r in self.sessions[session]['data'] if r['Sample'] == sample]) + 1
-				]) for sample in anchors]).T,
-			np.array([ np.array([0, 0]) + self.Nominal_D4x[sample] for sample in anchors]).T)
-		unknown_avg = (np.array([ np.array([
-				np.min([r[f'd{self._4x}'] for r in self.sessions[session]['data'] if r['Sample'] == sample]) - 1,
-				np.max([r[f'd{self._4x}'] for r in self.sessions[session]['data'] if r['Sample'] == sample]) + 1
-				]) for sample in unknowns]).T,
-			np.array([ np.array([0, 0]) + self.unknowns[sample][f'D{self._4x}'] for sample in unknowns]).T)
+		sdata = self.sessions[session]['data']
+		d4x = np.fromiter((r[f'd{self._4x}'] for r in sdata), dtype = float, count = len(sdata))
+		D4x = np.fromiter((r[f'D{self._4x}'] for r in sdata), dtype = float, count = len(sdata))
+		is_anchor = self._anchor_mask[self._session_mask[session]]
+		sample_index = self._sample_index[self._session_mask[session]]
+		# d4x range of each sample within this session, in a single pass:
+		d4x_min, d4x_max = _group_min_max(d4x, sample_index, len(self.samples))
+		d4x_range = {
+			sample: [d4x_min[k] - 1, d4x_max[k] + 1]
+			for k, sample in enumerate(self.samples)
+			if np.isfinite(d4x_min[k])
+			}
+		anchors = [a for a in self.anchors if a in d4x_range]
+		unknowns = [u for u in self.unknowns if u in d4x_range]
+		anchors_d = d4x[is_anchor].tolist()
+		anchors_D = D4x[is_anchor].tolist()
+		unknowns_d = d4x[~is_anchor].tolist()
+		unknowns_D = D4x[~is_anchor].tolist()
+		anchor_avg = (np.array([d4x_range[sample] for sample in anchors]).T,
+			np.array([[self.Nominal_D4x[sample]]*2 for sample in anchors]).T)
+		unknown_avg = (np.array([d4x_range[sample] for sample in unknowns]).T,
+			np.array([[self.unknowns[sample][f'D{self._4x}']]*2 for sample in unknowns]).T)
 		
 		
 		if fig == 'new':
@@ -2629,14 +3020,7 @@ class D4xdata(list):
 			*unknown_avg,
 			**kw_plot_unknown_avg)
 		if xylimits == 'constant':
-			x = [r[f'd{self._4x}'] for r in self]
-			y = [r[f'D{self._4x}'] for r in self]
-			x1, x2, y1, y2 = np.min(x), np.max(x), np.min(y), np.max(y)
-			w, h = x2-x1, y2-y1
-			x1 -= w/20
-			x2 += w/20
-			y1 -= h/20
-			y2 += h/20
+			x1, x2, y1, y2 = self._constant_xylimits()
 			ppl.axis([x1, x2, y1, y2])
 		elif xylimits == 'free':
 			x1, x2, y1, y2 = ppl.axis()
@@ -2646,7 +3030,7 @@ class D4xdata(list):
 		if error_contour_interval != 'none':
 			xi, yi = np.linspace(x1, x2), np.linspace(y1, y2)
 			XI,YI = np.meshgrid(xi, yi)
-			SI = np.array([[self.standardization_error(session, x, y) for x in xi] for y in yi])
+			SI = self.standardization_error(session, XI, YI)
 			if error_contour_interval == 'auto':
 				rng = np.max(SI) - np.min(SI)
 				if rng <= 0.01:
@@ -2718,6 +3102,7 @@ class D4xdata(list):
 		+ `yspan`: factor controlling the range of y values shown in plot
 		  (by default: `yspan = 1.5 if kde else 1.0`)
 		'''
+		ppl = _pyplot()
 		
 		from matplotlib import ticker
 
@@ -2763,41 +3148,37 @@ class D4xdata(list):
 
 		ax1.yaxis.set_major_formatter(ticker.FuncFormatter(lambda x, pos: f'${x:+.0f}$' if x else '$0$'))
 
-		session = self[0]['Session']
-		x1 = 0
 # 		ymax = np.max([1e3 * (r['D47'] - self.samples[r['Sample']]['D47']) for r in self])
+		# session boundaries:
+		breaks = (np.flatnonzero(np.diff(self._session_index)) + 1).tolist()
+		for k in breaks:
+			ppl.axvline(k - 0.5, color = 'k', lw = .5)
+		sessions = list(self.sessions)
 		x_sessions = {}
-		one_or_more_singlets = False
-		one_or_more_multiplets = False
-		multiplets = set()
-		for k,r in enumerate(self):
-			if r['Session'] != session:
-				x2 = k-1
-				x_sessions[session] = (x1+x2)/2
-				ppl.axvline(k - 0.5, color = 'k', lw = .5)
-				session = r['Session']
-				x1 = k
-			singlet = len(self.samples[r['Sample']]['data']) == 1
-			if not singlet:
-				multiplets.add(r['Sample'])
-			if r['Sample'] in self.unknowns:
-				if singlet:
-					one_or_more_singlets = True
-				else:
-					one_or_more_multiplets = True
-			kw = dict(
-				marker = 'x' if singlet else '+',
-				ms = 4 if singlet else 5,
-				ls = 'None',
-				mec = colors[r['Sample']] if r['Sample'] in colors else (0,0,0),
-				mew = 1,
-				alpha = 0.2 if singlet else 1,
+		for x1, x2 in zip([0] + breaks, [k-1 for k in breaks] + [len(self) - 1]):
+			x_sessions[sessions[self._session_index[x1]]] = (x1+x2)/2
+
+		multiplets = {s for s in self.samples if len(self.samples[s]['data']) > 1}
+		one_or_more_singlets = any(u not in multiplets for u in self.unknowns)
+		one_or_more_multiplets = any(u in multiplets for u in self.unknowns)
+
+		# one plot() call per distinct marker style:
+		styles = {}
+		for k, sample in enumerate(self.samples):
+			singlet = sample not in multiplets
+			mec = colors[sample] if sample in colors else (0,0,0)
+			style = (
+				'x' if singlet else '+',
+				4 if singlet else 5,
+				mec if isinstance(mec, str) else tuple(mec),
+				0.2 if singlet or (highlight and sample not in highlight) else 1,
 				)
-			if highlight and r['Sample'] not in highlight:
-				kw['alpha'] = 0.2
-			ppl.plot(k, 1e3 * r[f'D{self._4x}_residual'], **kw)
-		x2 = k
-		x_sessions[session] = (x1+x2)/2
+			styles.setdefault(style, []).append(k)
+		residuals = 1e3 * self._column(f'D{self._4x}_residual')
+		for (marker, ms, mec, alpha), codes in styles.items():
+			G = np.isin(self._sample_index, codes)
+			ppl.plot(np.flatnonzero(G), residuals[G], marker = marker, ms = ms, ls = 'None', mec = mec, mew = 1, alpha = alpha)
+		kw = dict(ls = 'None', mew = 1)
 
 		ppl.axhspan(-self.repeatability[f'r_D{self._4x}']*1000, self.repeatability[f'r_D{self._4x}']*1000, color = 'k', alpha = .05, lw = 1)
 		ppl.axhspan(-self.repeatability[f'r_D{self._4x}']*1000*self.t95, self.repeatability[f'r_D{self._4x}']*1000*self.t95, color = 'k', alpha = .05, lw = 1)
@@ -2862,12 +3243,11 @@ class D4xdata(list):
 
 		if hist or kde:
 			ppl.sca(ax2)
-			X = 1e3 * np.array([r[f'D{self._4x}_residual'] for r in self if r['Sample'] in multiplets or r['Sample'] in self.anchors])
+			X = residuals[self._anchor_mask | np.array([r['Sample'] in multiplets for r in self], dtype = bool)]
 
 			if kde:
-				from scipy.stats import gaussian_kde
 				yi = np.linspace(ymin, ymax, 201)
-				xi = gaussian_kde(X).evaluate(yi)
+				xi = _gaussian_kde(X, yi)
 				ppl.fill_betweenx(yi, xi, xi*0, fc = (0,0,0,.15), lw = 1, ec = (.75,.75,.75,1))
 # 				ppl.plot(xi, yi, 'k-', lw = 1)
 			elif hist:
@@ -2935,22 +3315,24 @@ class D4xdata(list):
 		+ `figsize`: (width, height) of figure
 		+ `dpi`: resolution for PNG output
 		'''
+		ppl = _pyplot()
 
 		asamples = [s for s in self.anchors]
 		usamples = [s for s in self.unknowns]
 		if output is None or output == 'fig':
 			fig = ppl.figure(figsize = figsize)
 			ppl.subplots_adjust(*subplots_adjust)
-		Xmin = min([r['TimeTag'] if vs_time else j for j,r in enumerate(self)])
-		Xmax = max([r['TimeTag'] if vs_time else j for j,r in enumerate(self)])
+		X_all = self._column('TimeTag') if vs_time else np.arange(len(self))
+		Xmin = X_all.min()
+		Xmax = X_all.max()
 		Xmax += (Xmax-Xmin)/40
 		Xmin -= (Xmax-Xmin)/41
+		X_by_sample = {s: [] for s in self.samples}
+		for x, r in zip(X_all.tolist(), self):
+			X_by_sample[r['Sample']].append(x)
 		for k, s in enumerate(asamples + usamples):
-			if vs_time:
-				X = [r['TimeTag'] for r in self if r['Sample'] == s]
-			else:
-				X = [x for x,r in enumerate(self) if r['Sample'] == s]
-			Y = [-k for x in X]
+			X = X_by_sample[s]
+			Y = np.full(len(X), -k)
 			ppl.plot(X, Y, 'o', mec = None, mew = 0, mfc = 'b' if s in usamples else 'r', ms = 3, alpha = .75)
 			ppl.axhline(-k, color = 'b' if s in usamples else 'r', lw = .5, alpha = .25)
 			ppl.text(Xmax, -k, f'   {s}', va = 'center', ha = 'left', size = 7, color = 'b' if s in usamples else 'r')
@@ -2964,15 +3346,17 @@ class D4xdata(list):
             )
 			
 
+		# first and last analysis of each session:
+		X_session_min, X_session_max = _group_min_max(X_all, self._session_index, len(self.sessions))
+
 		x2 = -1
-		for session in self.sessions:
-			x1 = min([r['TimeTag'] if vs_time else j for j,r in enumerate(self) if r['Session'] == session])
+		for session, x1, x2_next in zip(self.sessions, X_session_min.tolist(), X_session_max.tolist()):
 			if vs_time:
 				ppl.axvline(x1, color = 'k', lw = .75)
 			if x2 > -1:
 				if not vs_time:
 					ppl.axvline((x1+x2)/2, color = 'k', lw = .75, alpha = .5)
-			x2 = max([r['TimeTag'] if vs_time else j for j,r in enumerate(self) if r['Session'] == session])
+			x2 = x2_next
 # 			from xlrd import xldate_as_datetime
 # 			print(session, xldate_as_datetime(x1, 0), xldate_as_datetime(x2, 0))
 			if vs_time:
@@ -3028,6 +3412,7 @@ class D4xdata(list):
 		+ `labeldist`: distance (in inches) from replicate markers to replicate labels
 		+ `radius`: radius of the dashed circle providing scale. No circle if `radius = 0`.
 		'''
+		ppl = _pyplot()
 
 		from matplotlib.patches import Ellipse
 
@@ -3036,6 +3421,14 @@ class D4xdata(list):
 
 		saved = {}
 
+		# average bulk composition of every sample, in one pass:
+		N = np.bincount(self._sample_index, minlength = len(self.samples))
+		XY0_by_sample = np.array([
+			np.bincount(self._sample_index, weights = self._column(k), minlength = len(self.samples)) / N
+			for k in ['d18O_VSMOW', 'd13C_VPDB']
+			]).T
+		sample_codes = {s: k for k, s in enumerate(self.samples)}
+
 		for s in samples:
 
 			fig = ppl.figure(figsize = figsize)
@@ -3048,7 +3441,7 @@ class D4xdata(list):
 
 			XY = np.array([[_['d18O_VSMOW'], _['d13C_VPDB']] for _ in self.samples[s]['data']])
 			UID = [_['UID'] for _ in self.samples[s]['data']]
-			XY0 = XY.mean(0)
+			XY0 = XY0_by_sample[sample_codes[s]]
 
 			for xy in XY:
 				ppl.plot([xy[0], XY0[0]], [xy[1], XY0[1]], '-', lw = 1, color = analysis_color)
@@ -3070,11 +3463,11 @@ class D4xdata(list):
 				y0 + 1.2*dy,
 				])			
 
-			XY0_in_display_space = fig.dpi_scale_trans.inverted().transform(ax.transData.transform(XY0))
+			data_to_display = ax.transData + fig.dpi_scale_trans.inverted()
+			XY0_in_display_space, *XY_in_display_space = data_to_display.transform(np.vstack((XY0, XY)))
 
-			for xy, uid in zip(XY, UID):
+			for xy, xy_in_display_space, uid in zip(XY, XY_in_display_space, UID):
 
-				xy_in_display_space = fig.dpi_scale_trans.inverted().transform(ax.transData.transform(xy))
 				vector_in_display_space = xy_in_display_space - XY0_in_display_space
 
 				if (vector_in_display_space**2).sum() > 0:
@@ -3169,10 +3562,11 @@ class D4xdata(list):
 		
 		out = [['Sample']] + [[s] for s in samples]
 		out[0] += [f'D{self._4x}', f'D{self._4x}_SE', f'D{self._4x}_correl']
+		D4x = np.char.mod(f'%.{D4x_precision}f', [self.samples[s][f'D{self._4x}'] for s in samples])
+		SE_D4x = np.char.mod(f'%.{D4x_precision}f', [self.samples[s][f'SE_D{self._4x}'] for s in samples])
+		correl = np.char.mod(f'%.{correl_precision}f', self._sample_D4x_correl_matrix(samples))
 		for k,s in enumerate(samples):
-			out[k+1] += [f'{self.samples[s][f"D{self._4x}"]:.4f}', f'{self.samples[s][f"SE_D{self._4x}"]:.4f}']
-			for s2 in samples:
-				out[k+1] += [f'{self.sample_D4x_correl(s,s2):.4f}']
+			out[k+1] += [D4x[k], SE_D4x[k], *correl[k]]
 		
 		if not os.path.exists(dir):
 			os.makedirs(dir)
@@ -3384,6 +3778,63 @@ class _SessionPlot():
 	def __init__(self):
 		pass
 
+def _apply_nominal(data, nominal):
+	'''
+	Assign custom anchor values read by `_cli()` to a `D47data` or `D48data` object
+	(used by `_run_D47()` and `_run_D48()`), and return whether any values were assigned
+	'''
+	assigned = False
+	for k, attr in [
+		('d13C_VPDB', 'Nominal_d13C_VPDB'),
+		('d18O_VPDB', 'Nominal_d18O_VPDB'),
+		(f'D{data._4x}', 'Nominal_D4x'),
+		]:
+		if nominal[k]:
+			setattr(data, attr, dict(nominal[k]))
+			assigned = True
+	return assigned
+
+
+def _run_D47(data, nominal, output_dir, plots = True, stale = False, max_workers = 1):
+	'''
+	Standardize a `D47data` object and save its individual outputs
+	(used by `_cli()`, possibly in a worker process). The object is only
+	refreshed if custom anchors are assigned or if `stale` is `True`.
+	Session plots are rendered using `max_workers` processes.
+	'''
+	if _apply_nominal(data, nominal) or stale:
+		data.refresh()
+	data.wg()
+	data.crunch()
+	data.standardize()
+	if plots:
+		data.plot_residuals(dir = output_dir, filename = 'D47_residuals.pdf', kde = True)
+		data.plot_bulk_compositions(dir = output_dir + '/bulk_compositions')
+		data.plot_sessions(dir = output_dir, max_workers = max_workers)
+	data.save_D47_correl(dir = output_dir)
+	return data
+
+
+def _run_D48(data, nominal, output_dir, plots = True, stale = False, max_workers = 1):
+	'''
+	Standardize a `D48data` object and save its individual outputs
+	(used by `_cli()`, possibly in a worker process). The object is only
+	refreshed if custom anchors are assigned or if `stale` is `True`.
+	Session plots are rendered using `max_workers` processes.
+	'''
+	if _apply_nominal(data, nominal) or stale:
+		data.refresh()
+	data.wg()
+	data.crunch()
+	data.standardize()
+	if plots:
+		data.plot_sessions(dir = output_dir, max_workers = max_workers)
+		data.plot_residuals(dir = output_dir, filename = 'D48_residuals.pdf', kde = True)
+		data.plot_distribution_of_analyses(dir = output_dir)
+	data.save_D48_correl(dir = output_dir)
+	return data
+
+
 _app = typer.Typer(
 	add_completion = False,
 	context_settings={'help_option_names': ['-h', '--help']},
@@ -3397,6 +3848,7 @@ def _cli(
 	anchors: Annotated[str, typer.Option('--anchors', '-a', help = 'The path of a file specifying custom anchors')] = 'none',
 	output_dir: Annotated[str, typer.Option('--output-dir', '-o', help = 'Specify the output directory')] = 'output',
 	run_D48: Annotated[bool, typer.Option('--D48', help = 'Also standardize D48')] = False,
+	no_plots: Annotated[bool, typer.Option('--no-plots', help = 'Skip all plots')] = False,
 	):
 	"""
 	Process raw D47 data and return standardized results.
@@ -3421,7 +3873,7 @@ def _cli(
 	* [b]D47data.plot_bulk_compositions()[/b]
 	* [b]D47data.save_D47_correl()[/b]
 	
-	Optionally, also apply similar methods for [b]]D48[/b].
+	Optionally, also apply similar methods for [b]]D48[/b]. With [b]--no-plots[/b], the plotting steps are skipped.
 	
 	[b]Example CSV file for --anchors option:[/b]	
 	[i]
@@ -3452,87 +3904,54 @@ def _cli(
 
 	if exclude != 'none':
 		exclude = read_csv(exclude)
-		exclude_uid = {r['UID'] for r in exclude if 'UID' in r}
-		exclude_sample = {r['Sample'] for r in exclude if 'Sample' in r}
+		exclude_uid = frozenset(r['UID'] for r in exclude if 'UID' in r)
+		exclude_sample = frozenset(r['Sample'] for r in exclude if 'Sample' in r)
 	else:
-		exclude_uid = []
-		exclude_sample = []
-	
-	data = D47data([r for r in data if r['UID'] not in exclude_uid and r['Sample'] not in exclude_sample])
+		exclude_uid = frozenset()
+		exclude_sample = frozenset()
+
+	N = len(data)
+	if exclude_uid and exclude_sample:
+		data[:] = [r for r in data if r['UID'] not in exclude_uid and r['Sample'] not in exclude_sample]
+	elif exclude_uid:
+		data[:] = [r for r in data if r['UID'] not in exclude_uid]
+	elif exclude_sample:
+		data[:] = [r for r in data if r['Sample'] not in exclude_sample]
+	# data.read() already called data.refresh(), which is only needed again if some analyses were excluded:
+	stale = len(data) != N
 
+	if run_D48:
+		# D47data and D48data both modify their analyses in place, so D48 processing gets its own copy of the parsed rows
+		rows_D48 = [dict(r) for r in data]
+
+	# nominal values of custom anchors, read in a single pass:
+	nominal = {k: {} for k in ['d13C_VPDB', 'd18O_VPDB', 'D47', 'D48']}
 	if anchors != 'none':
-		anchors = read_csv(anchors)
-		if len([_ for _ in anchors if 'd13C_VPDB' in _]):
-			data.Nominal_d13C_VPDB = {
-				_['Sample']: _['d13C_VPDB']
-				for _ in anchors
-				if 'd13C_VPDB' in _
-				}
-		if len([_ for _ in anchors if 'd18O_VPDB' in _]):
-			data.Nominal_d18O_VPDB = {
-				_['Sample']: _['d18O_VPDB']
-				for _ in anchors
-				if 'd18O_VPDB' in _
-				}
-		if len([_ for _ in anchors if 'D47' in _]):
-			data.Nominal_D4x = {
-				_['Sample']: _['D47']
-				for _ in anchors
-				if 'D47' in _
-				}
-
-	data.refresh()
-	data.wg()
-	data.crunch()
-	data.standardize()
-	data.summary(dir = output_dir)
-	data.plot_residuals(dir = output_dir, filename = 'D47_residuals.pdf', kde = True)
-	data.plot_bulk_compositions(dir = output_dir + '/bulk_compositions')
-	data.plot_sessions(dir = output_dir)
-	data.save_D47_correl(dir = output_dir)
-	
+		for _ in read_csv(anchors):
+			for k in nominal:
+				if k in _:
+					nominal[k][_['Sample']] = _[k]
+
 	if not run_D48:
+		_run_D47(data, nominal, output_dir, plots = not no_plots, stale = stale, max_workers = None)
+		data.summary(dir = output_dir)
 		data.table_of_samples(dir = output_dir)
 		data.table_of_analyses(dir = output_dir)
 		data.table_of_sessions(dir = output_dir)
 
+	else:
+		# the D47 and D48 pipelines are independent until the joint tables, so run them in parallel:
+		from concurrent.futures import ProcessPoolExecutor
 
-	if run_D48:
-		data2 = D48data()
-		print(rawdata)
-		data2.read(rawdata)
-
-		data2 = D48data([r for r in data2 if r['UID'] not in exclude_uid and r['Sample'] not in exclude_sample])
-
-		if anchors != 'none':
-			if len([_ for _ in anchors if 'd13C_VPDB' in _]):
-				data2.Nominal_d13C_VPDB = {
-					_['Sample']: _['d13C_VPDB']
-					for _ in anchors
-					if 'd13C_VPDB' in _
-					}
-			if len([_ for _ in anchors if 'd18O_VPDB' in _]):
-				data2.Nominal_d18O_VPDB = {
-					_['Sample']: _['d18O_VPDB']
-					for _ in anchors
-					if 'd18O_VPDB' in _
-					}
-			if len([_ for _ in anchors if 'D48' in _]):
-				data2.Nominal_D4x = {
-					_['Sample']: _['D48']
-					for _ in anchors
-					if 'D48' in _
-					}
+		# each pipeline gets half of the available cores to render its session plots:
+		max_workers = max(1, (os.cpu_count() or 2) // 2)
+		with ProcessPoolExecutor(max_workers = 2) as executor:
+			job47 = executor.submit(_run_D47, data, nominal, output_dir, not no_plots, stale, max_workers)
+			job48 = executor.submit(_run_D48, D48data(rows_D48), nominal, output_dir, not no_plots, False, max_workers)
+			data, data2 = job47.result(), job48.result()
 
-		data2.refresh()
-		data2.wg()
-		data2.crunch()
-		data2.standardize()
+		data.summary(dir = output_dir)
 		data2.summary(dir = output_dir)
-		data2.plot_sessions(dir = output_dir)
-		data2.plot_residuals(dir = output_dir, filename = 'D48_residuals.pdf', kde = True)
-		data2.plot_distribution_of_analyses(dir = output_dir)
-		data2.save_D48_correl(dir = output_dir)
 
 		table_of_analyses(data, data2, dir = output_dir)
 		table_of_samples(data, data2, dir = output_dir)
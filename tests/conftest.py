@@ -0,0 +1,4 @@
+import matplotlib
+
+# the plotting tests only write files, so use the non-interactive backend:
+matplotlib.use('Agg')
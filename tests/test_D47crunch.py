@@ -1,4 +1,5 @@
 import D47crunch
+import numpy as np
 from math import isclose
 
 def test_fCO2eq():
@@ -79,6 +80,37 @@ def test_D47data_init():
 	assert([s for s in x.unknowns] == sorted({r['Sample'] for r in x if r['Sample'] not in x.Nominal_D47}))
 
 
+def test_compute_isobar_ratios():
+	x = D47crunch.D47data()
+	R13, R18 = 0.0112, 0.00205
+	R17 = x.R17_VSMOW * (R18 / x.R18_VSMOW) ** x.LAMBDA_17
+	C12, C16 = 1 / (1 + R13), 1 / (1 + R17 + R18)
+	C13, C17, C18 = C12 * R13, C16 * R17, C16 * R18
+	C626 = C16 * C12 * C16
+	expected = [
+		(C16 * C13 * C16 + 2 * C16 * C12 * C17) / C626,
+		(2 * C16 * C12 * C18 + 2 * C16 * C13 * C17 + C17 * C12 * C17) / C626,
+		(2 * C16 * C13 * C18 + 2 * C17 * C12 * C18 + C17 * C13 * C17) / C626 * 1.0006,
+		(2 * C17 * C13 * C18 + C18 * C12 * C18) / C626,
+		C18 * C13 * C18 / C626,
+		]
+	for R, Rx in zip(x.compute_isobar_ratios(R13, R18, D47 = 0.6), expected):
+		assert(isclose(R, Rx, rel_tol = 1e-13))
+
+
+def test_compute_bulk_delta():
+	x = D47crunch.D47data()
+	R45, R46 = x.compute_isobar_ratios(
+		x.R13_VPDB * (1 + np.array([-10., 2.]) / 1000),
+		x.R18_VSMOW * (1 + np.array([25., 38.]) / 1000),
+		)[:2]
+	d13C, d18O = x.compute_bulk_delta(R45, R46)
+	for k in range(2):
+		assert((d13C[k], d18O[k]) == x.compute_bulk_delta(R45[k], R46[k]))
+	assert(isclose(d13C[0], -10., abs_tol = 1e-6))
+	assert(isclose(d18O[1], 38., abs_tol = 1e-3))
+
+
 def test_D47data_standardize():
 	rawdata_input_str = '''UID\tSession\tSample\td45\td46\td47\td13Cwg_VPDB\td18Owg_VSMOW
 A01\tSession01\tETH-1\t5.795017\t11.627668\t16.893512\t-3.75\t25.13